@@ -0,0 +1,79 @@
+"""Numeric kernels used by the collision checker.
+
+The kernels work on flat coordinate sequences only, so the checker can
+extract positions once per validation and map the returned indices back to
+placements.
+"""
+from __future__ import annotations
+
+from math import floor
+from typing import Dict, List, Sequence, Tuple
+
+
+def bounds_violations(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    width: float,
+    depth: float,
+    limit_x: float,
+    limit_y: float,
+    clearance: float,
+) -> List[Tuple[int, int]]:
+    """Return ``(index, axis)`` pairs for boxes outside the usable area (axis 0 = X, 1 = Y)."""
+
+    # Bounds are shifted onto the box centre so each coordinate is compared
+    # against two scalars only.
+    min_x = width / 2 - clearance
+    max_x = limit_x + clearance - width / 2
+    min_y = depth / 2 - clearance
+    max_y = limit_y + clearance - depth / 2
+    violations: List[Tuple[int, int]] = []
+    append = violations.append
+    for idx, (x, y) in enumerate(zip(xs, ys)):
+        if x < min_x or x > max_x:
+            append((idx, 0))
+        if y < min_y or y > max_y:
+            append((idx, 1))
+    return violations
+
+
+def overlap_pairs(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    width: float,
+    depth: float,
+    clearance: float,
+) -> List[Tuple[int, int]]:
+    """Return the ``(i, j)`` index pairs, ``i < j``, of overlapping footprints."""
+
+    max_dx = width - clearance
+    max_dy = depth - clearance
+    # Uniform grid with cells at least as large as the accept window: two boxes
+    # can only overlap when they sit in the same or in adjacent cells. A
+    # negative clearance widens the window beyond the footprint.
+    cell_w = max(max_dx, width)
+    cell_d = max(max_dy, depth)
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    cells: List[Tuple[int, int]] = []
+    for idx, (x, y) in enumerate(zip(xs, ys)):
+        key = (floor(x / cell_w), floor(y / cell_d))
+        grid.setdefault(key, []).append(idx)
+        cells.append(key)
+    min_dx = -max_dx
+    min_dy = -max_dy
+    pairs: List[Tuple[int, int]] = []
+    for i, (cell_x, cell_y) in enumerate(cells):
+        xi = xs[i]
+        yi = ys[i]
+        candidates = sorted(
+            j
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for j in grid.get((cell_x + dx, cell_y + dy), ())
+            if j > i
+        )
+        for j in candidates:
+            # ``-m < d < m`` is ``abs(d) < m`` without the builtin call per pair.
+            if min_dx < xs[j] - xi < max_dx and min_dy < ys[j] - yi < max_dy:
+                pairs.append((i, j))
+    return pairs
@@ -0,0 +1,57 @@
+"""Numeric kernels used by the layer planner.
+
+The kernels produce flat coordinate and block-code sequences; the planner wraps
+them into ``LayerPlacement`` records.
+"""
+from __future__ import annotations
+
+import sys
+from typing import List, Tuple
+
+# Block codes returned by ``build_grid`` index into this tuple. The names are
+# interned so every placement shares the same string objects.
+BLOCK_NAMES: Tuple[str, ...] = tuple(sys.intern(name) for name in ("center", "west", "east", "south", "north"))
+
+
+# Block code per cell class, indexed by ``row_class * 3 + column_class`` where a
+# class is 0 for the first line, 2 for the last one and 1 in between. Corners
+# belong to the south/north blocks.
+_CELL_CODES: Tuple[int, ...] = (
+    3, 3, 3,
+    1, 0, 2,
+    4, 4, 4,
+)
+
+
+def block_code(row: int, col: int, rows: int, columns: int) -> int:
+    """Return the block code of a grid cell."""
+
+    row_class = 0 if row == 0 else 2 if row == rows - 1 else 1
+    column_class = 0 if col == 0 else 2 if col == columns - 1 else 1
+    return _CELL_CODES[row_class * 3 + column_class]
+
+
+def build_grid(
+    columns: int,
+    rows: int,
+    width: float,
+    depth: float,
+    offset_x: float,
+    offset_y: float,
+    z: float,
+) -> Tuple[List[Tuple[float, float, float]], List[int]]:
+    """Return row-major box centres and block codes for a ``columns`` x ``rows`` grid."""
+
+    # Coordinates depend on the column (x) or the row (y) only, and block codes
+    # only on whether the row is the bottom, the top or an inner one: compute
+    # each axis once and expand the grid in a single pass.
+    column_xs = [offset_x + col * width + width / 2 for col in range(columns)]
+    row_ys = [offset_y + row * depth + depth / 2 for row in range(rows)]
+    bottom = [block_code(0, col, rows, columns) for col in range(columns)]
+    top = [block_code(rows - 1, col, rows, columns) for col in range(columns)]
+    inner = [block_code(1, col, rows, columns) for col in range(columns)] if rows > 2 else []
+    row_codes = [bottom if row == 0 else top if row == rows - 1 else inner for row in range(rows)]
+
+    positions = [(x, y, z) for y in row_ys for x in column_xs]
+    codes = [code for row in row_codes for code in row]
+    return positions, codes
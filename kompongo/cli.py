@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import argparse
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
 
 from .annotations import PlacementAnnotator
 from .collisions import CollisionChecker
@@ -137,10 +138,10 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _parse_overrides(values: list[str] | None) -> Dict[str, ApproachConfig]:
+def _parse_overrides(values: list[str] | None) -> Mapping[str, ApproachConfig]:
     overrides: Dict[str, ApproachConfig] = {}
     if not values:
-        return overrides
+        return MappingProxyType(overrides)
     for value in values:
         try:
             block, payload = value.split("=", 1)
@@ -153,13 +154,14 @@ def _parse_overrides(values: list[str] | None) -> Dict[str, ApproachConfig]:
             raise ValueError(
                 f"Formato override non valido '{value}'. Usa blocco=DIREZIONE:DISTANZA"
             ) from exc
-    return overrides
+    # Read-only view: every layer shares it instead of receiving its own copy.
+    return MappingProxyType(overrides)
 
 
-def _apply_approach(plan: LayerPlan, direction: str, distance: float, overrides: Dict[str, ApproachConfig]) -> None:
+def _apply_approach(plan: LayerPlan, direction: str, distance: float, overrides: Mapping[str, ApproachConfig]) -> None:
     plan.metadata["approach_direction"] = direction
     plan.metadata["approach_distance"] = f"{distance:.2f}"
-    plan.approach_overrides = overrides.copy()
+    plan.approach_overrides = overrides
 
 
 def _calculate_layer(request: LayerRequest) -> LayerPlan:
@@ -182,15 +184,13 @@ def _build_notes(values: list[str]) -> dict[str, str]:
 
 
 def _print_table(headers: tuple[str, ...], rows: list[tuple[str, ...]]) -> None:
-    widths = [len(header) for header in headers]
-    for row in rows:
-        for idx, cell in enumerate(row):
-            widths[idx] = max(widths[idx], len(cell))
-    format_str = "  ".join(f"{{:<{width}}}" for width in widths)
-    print(format_str.format(*headers))
-    print("  ".join("-" * width for width in widths))
-    for row in rows:
-        print(format_str.format(*row))
+    if rows:
+        widths = [max(len(header), *map(len, column)) for header, column in zip(headers, zip(*rows))]
+    else:
+        widths = [len(header) for header in headers]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in (headers, *rows)]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    print("\n".join(lines))
 
 
 def run_catalog(args: argparse.Namespace) -> None:
@@ -308,7 +308,7 @@ def run_plan(args: argparse.Namespace) -> None:
 
     if args.export:
         exporter = PlanExporter(annotator=annotator)
-        path = exporter.to_file(plan, args.export)
+        path = exporter.to_file(plan, args.export, annotations=[annotations])
         print(f"Plan exported to {path}")
 
     repo.close()
@@ -350,6 +350,7 @@ def run_stack(args: argparse.Namespace) -> None:
     print(
         f"Computed {sequence.levels()} layers totaling {sequence.total_boxes()} boxes (max height {sequence.max_height():.2f}mm)"
     )
+    layer_annotations = []
     for idx, layer in enumerate(sequence.layers, start=1):
         print(
             f"Layer {idx}: corner={layer.start_corner} orientation={layer.orientation} fill={layer.fill_ratio:.2%}"
@@ -358,6 +359,7 @@ def run_stack(args: argparse.Namespace) -> None:
         _apply_approach(layer, layer_direction, args.approach_distance, overrides)
 
         annotations = annotator.annotate(layer)
+        layer_annotations.append(annotations)
         if annotations:
             first = annotations[0]
             label = first.label_position
@@ -383,7 +385,7 @@ def run_stack(args: argparse.Namespace) -> None:
 
     if args.export:
         exporter = PlanExporter(annotator=annotator)
-        path = exporter.to_file(sequence, args.export)
+        path = exporter.to_file(sequence, args.export, annotations=layer_annotations)
         print(f"Sequence exported to {path}")
 
     repo.close()
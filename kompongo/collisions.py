@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import List, Sequence, Tuple
 
-from .models import LayerPlan, LayerPlacement, LayerRequest
+from ._collision_kernels import bounds_violations, overlap_pairs
+from .models import LayerPlan, LayerRequest
+
+_AXIS_LABELS = ("width", "depth")
 
 
 @dataclass
@@ -17,9 +20,10 @@ class CollisionChecker:
         self.clearance = clearance
 
     def validate(self, plan: LayerPlan, request: LayerRequest) -> Sequence[Collision]:
-        collisions: List[Collision] = []
-        collisions.extend(self._check_pallet_bounds(plan, request))
-        collisions.extend(self._check_overlap(plan, request))
+        xs, ys = self._positions(plan)
+        footprint = self._box_footprint(plan, request)
+        collisions = self._check_pallet_bounds(plan, request, xs, ys, footprint)
+        collisions += self._check_overlap(plan, xs, ys, footprint)
         return collisions
 
     def _box_footprint(self, plan: LayerPlan, request: LayerRequest) -> tuple[float, float]:
@@ -28,32 +32,38 @@ class CollisionChecker:
             return box_dims.width, box_dims.depth
         return box_dims.depth, box_dims.width
 
-    def _check_pallet_bounds(self, plan: LayerPlan, request: LayerRequest) -> Iterable[Collision]:
+    def _positions(self, plan: LayerPlan) -> Tuple[List[float], List[float]]:
+        xs = [position[0] for position in plan.positions]
+        ys = [position[1] for position in plan.positions]
+        return xs, ys
+
+    def _check_pallet_bounds(
+        self,
+        plan: LayerPlan,
+        request: LayerRequest,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        footprint: Tuple[float, float],
+    ) -> List[Collision]:
         limit_x = request.pallet.dimensions.width + request.overhang_x * 2
         limit_y = request.pallet.dimensions.depth + request.overhang_y * 2
-        width, depth = self._box_footprint(plan, request)
-        half_width = width / 2
-        half_depth = depth / 2
-        for placement in plan.placements:
-            x_min = placement.position.x - half_width
-            x_max = placement.position.x + half_width
-            y_min = placement.position.y - half_depth
-            y_max = placement.position.y + half_depth
-            if x_min < -self.clearance or x_max > limit_x + self.clearance:
-                yield Collision(f"Box {placement.sequence_index} exceeds pallet width limits")
-            if y_min < -self.clearance or y_max > limit_y + self.clearance:
-                yield Collision(f"Box {placement.sequence_index} exceeds pallet depth limits")
-
-    def _check_overlap(self, plan: LayerPlan, request: LayerRequest) -> Iterable[Collision]:
+        width, depth = footprint
+        items = plan.placements
+        return [
+            Collision(f"Box {items[idx].sequence_index} exceeds pallet {_AXIS_LABELS[axis]} limits")
+            for idx, axis in bounds_violations(xs, ys, width, depth, limit_x, limit_y, self.clearance)
+        ]
+
+    def _check_overlap(
+        self,
+        plan: LayerPlan,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        footprint: Tuple[float, float],
+    ) -> List[Collision]:
         items = plan.placements
-        width, depth = self._box_footprint(plan, request)
-        for i, first in enumerate(items):
-            for second in items[i + 1 :]:
-                if self._overlap(first, second, width, depth):
-                    yield Collision(f"Collision between {first.sequence_index} and {second.sequence_index}")
-
-    def _overlap(self, a: LayerPlacement, b: LayerPlacement, width: float, depth: float) -> bool:
-        return (
-            abs(a.position.x - b.position.x) < width - self.clearance
-            and abs(a.position.y - b.position.y) < depth - self.clearance
-        )
+        width, depth = footprint
+        return [
+            Collision(f"Collision between {items[i].sequence_index} and {items[j].sequence_index}")
+            for i, j in overlap_pairs(xs, ys, width, depth, self.clearance)
+        ]
@@ -2,13 +2,23 @@
 from __future__ import annotations
 
 import json
+from itertools import zip_longest
 from pathlib import Path
+from typing import Sequence
 
-from .annotations import PlacementAnnotator
-from .models import LayerPlan, LayerSequencePlan
+from .annotations import PlacementAnnotation, PlacementAnnotator
+from .models import LayerPlacement, LayerPlan, LayerSequencePlan
+
+try:  # pragma: no cover - optional accelerator
+    import orjson
+except ImportError:  # pragma: no cover - fallback to the standard library
+    orjson = None
 
 
 class PlanExporter:
+    # Sequences taller than this are streamed layer by layer by ``to_file``.
+    stream_threshold = 4
+
     def __init__(
         self,
         base_path: str | Path = "artifacts",
@@ -18,29 +28,83 @@ class PlanExporter:
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.annotator = annotator or PlacementAnnotator()
 
-    def to_file(self, plan: LayerPlan | LayerSequencePlan, filename: str) -> Path:
+    def to_file(
+        self,
+        plan: LayerPlan | LayerSequencePlan,
+        filename: str,
+        annotations: Sequence[Sequence[PlacementAnnotation]] | None = None,
+    ) -> Path:
+        """Write the plan as JSON, reusing per-layer ``annotations`` when the caller already has them."""
+        if isinstance(plan, LayerSequencePlan) and len(plan.layers) > self.stream_threshold:
+            return self.stream_to_file(plan, filename, annotations)
+        path = self.base_path / filename
+        path.write_bytes(self._serialize(plan, annotations))
+        return path
+
+    def stream_to_file(
+        self,
+        plan: LayerSequencePlan,
+        filename: str,
+        annotations: Sequence[Sequence[PlacementAnnotation]] | None = None,
+    ) -> Path:
+        """Write a sequence one layer at a time; the output matches ``to_file`` byte for byte."""
         path = self.base_path / filename
-        path.write_text(self._serialize(plan), encoding="utf-8")
+        header = self._encode(self._sequence_header(plan))
+        with path.open("wb") as handle:
+            # Reopen the header object (drop the closing "\n}") and append the layers
+            # with the nesting indentation the one-shot encoder would have used.
+            handle.write(header[:-2])
+            handle.write(b',\n  "layers": [')
+            for idx, layer in enumerate(plan.layers, start=1):
+                encoded = self._encode(self._layer_payload(layer, idx, annotations[idx - 1] if annotations else None))
+                if idx > 1:
+                    handle.write(b",")
+                handle.write(b"\n    " + encoded.replace(b"\n", b"\n    "))
+            handle.write(b"\n  ]\n}" if plan.layers else b"]\n}")
         return path
 
-    def to_payload(self, plan: LayerPlan | LayerSequencePlan) -> bytes:
-        return self._serialize(plan).encode("utf-8")
+    def to_payload(
+        self,
+        plan: LayerPlan | LayerSequencePlan,
+        annotations: Sequence[Sequence[PlacementAnnotation]] | None = None,
+    ) -> bytes:
+        return self._serialize(plan, annotations)
 
-    def _serialize(self, plan: LayerPlan | LayerSequencePlan) -> str:
+    def _serialize(
+        self,
+        plan: LayerPlan | LayerSequencePlan,
+        annotations: Sequence[Sequence[PlacementAnnotation]] | None = None,
+    ) -> bytes:
         if isinstance(plan, LayerSequencePlan):
-            payload = {
-                "type": "sequence",
-                "metadata": plan.metadata,
-                "levels": plan.levels(),
-                "total_boxes": plan.total_boxes(),
-                "layers": [self._layer_payload(layer, idx) for idx, layer in enumerate(plan.layers, start=1)],
-            }
+            payload = self._sequence_header(plan)
+            payload["layers"] = [
+                self._layer_payload(layer, idx, annotations[idx - 1] if annotations else None)
+                for idx, layer in enumerate(plan.layers, start=1)
+            ]
         else:
-            payload = self._layer_payload(plan, 1)
+            payload = self._layer_payload(plan, 1, annotations[0] if annotations else None)
             payload["type"] = "layer"
-        return json.dumps(payload, indent=2)
+        return self._encode(payload)
 
-    def _layer_payload(self, plan: LayerPlan, index: int) -> dict:
+    def _encode(self, payload: dict) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        return json.dumps(payload, indent=2).encode("utf-8")
+
+    def _sequence_header(self, plan: LayerSequencePlan) -> dict:
+        return {
+            "type": "sequence",
+            "metadata": plan.metadata,
+            "levels": plan.levels(),
+            "total_boxes": plan.total_boxes(),
+        }
+
+    def _layer_payload(
+        self,
+        plan: LayerPlan,
+        index: int,
+        annotations: Sequence[PlacementAnnotation] | None = None,
+    ) -> dict:
         return {
             "index": index,
             "orientation": plan.orientation,
@@ -49,35 +113,44 @@ class PlanExporter:
             "start_corner": plan.start_corner,
             "metadata": plan.metadata,
             "collisions": plan.collisions,
-            "placements": self._placement_payload(plan),
+            "placements": self._placement_payload(plan, annotations),
         }
 
-    def _placement_payload(self, plan: LayerPlan) -> list[dict]:
-        annotations = {annotation.placement_index: annotation for annotation in self.annotator.annotate(plan)}
-        items: list[dict] = []
-        for placement in plan.placements:
-            payload = {
-                "index": placement.sequence_index,
-                "block": placement.block,
-                "x": placement.position.x,
-                "y": placement.position.y,
-                "z": placement.position.z,
-                "rotation": placement.rotation,
+    def _placement_payload(
+        self,
+        plan: LayerPlan,
+        precomputed: Sequence[PlacementAnnotation] | None = None,
+    ) -> list[dict]:
+        if precomputed is None:
+            precomputed = self.annotator.annotate(plan)
+        # The annotator emits one annotation per placement in plan order (or none
+        # at all), so both sequences can be walked side by side.
+        return [
+            self._placement_entry(placement, annotation)
+            for placement, annotation in zip_longest(plan.placements, precomputed[: len(plan.placements)])
+        ]
+
+    def _placement_entry(self, placement: LayerPlacement, annotation: PlacementAnnotation | None) -> dict:
+        payload = {
+            "index": placement.sequence_index,
+            "block": placement.block,
+            "x": placement.position.x,
+            "y": placement.position.y,
+            "z": placement.position.z,
+            "rotation": placement.rotation,
+        }
+        if annotation:
+            payload["label"] = {
+                "x": annotation.label_position.x,
+                "y": annotation.label_position.y,
+                "z": annotation.label_position.z,
+                "face": annotation.label_face,
+            }
+            payload["approach"] = {
+                "direction": annotation.approach_direction,
+                "distance": annotation.approach_distance,
+                "dx": annotation.approach_vector.x,
+                "dy": annotation.approach_vector.y,
+                "dz": annotation.approach_vector.z,
             }
-            annotation = annotations.get(placement.sequence_index)
-            if annotation:
-                payload["label"] = {
-                    "x": annotation.label_position.x,
-                    "y": annotation.label_position.y,
-                    "z": annotation.label_position.z,
-                    "face": annotation.label_face,
-                }
-                payload["approach"] = {
-                    "direction": annotation.approach_direction,
-                    "distance": annotation.approach_distance,
-                    "dx": annotation.approach_vector.x,
-                    "dy": annotation.approach_vector.y,
-                    "dz": annotation.approach_vector.z,
-                }
-            items.append(payload)
-        return items
+        return payload
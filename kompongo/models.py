@@ -3,31 +3,33 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Iterable, List, Sequence
+from functools import cached_property
+from operator import attrgetter
+from typing import Iterable, List, Mapping, Sequence, Tuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dimensions:
     width: float
     depth: float
     height: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vector3:
     x: float
     y: float
     z: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PickupOffset:
     x: float = 0.0
     y: float = 0.0
     z: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Box:
     id: str
     dimensions: Dimensions
@@ -35,7 +37,7 @@ class Box:
     label_position: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Pallet:
     id: str
     dimensions: Dimensions
@@ -43,7 +45,7 @@ class Pallet:
     max_overhang_y: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tool:
     id: str
     name: str
@@ -58,7 +60,7 @@ class OrientationMode(str, Enum):
     BOTH = "both"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApproachConfig:
     direction: str
     distance: float
@@ -92,7 +94,7 @@ class LayerRequest:
         return self.max_overhang_y if self.max_overhang_y is not None else self.pallet.max_overhang_y
 
 
-@dataclass
+@dataclass(slots=True)
 class LayerPlacement:
     box_id: str
     position: Vector3
@@ -111,24 +113,75 @@ class LayerPlan:
     metadata: dict[str, str]
     collisions: List[str] = field(default_factory=list)
     box: Box | None = None
-    approach_overrides: Dict[str, ApproachConfig] = field(default_factory=dict)
+    approach_overrides: Mapping[str, ApproachConfig] = field(default_factory=dict)
+    _columns: tuple[list, List[Tuple[float, float, float]], List[int], float] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _order: tuple[List[Tuple[float, float, float]], str, Tuple[int, ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def positions(self) -> List[Tuple[float, float, float]]:
+        """Return the ``(x, y, z)`` centre of every placement, in placement order."""
+        return self._column_cache()[1]
+
+    @property
+    def sequence_indices(self) -> List[int]:
+        return self._column_cache()[2]
+
+    def _column_cache(self) -> tuple[list, List[Tuple[float, float, float]], List[int], float]:
+        # The columns are keyed on each placement's position and sequence index,
+        # so replacing the list or editing a placement in place rebuilds them.
+        key = list(map(_column_fields, self.placements))
+        cached = self._columns
+        if cached is None or cached[0] != key:
+            positions = [(position.x, position.y, position.z) for position, _ in key]
+            height = max((position[2] for position in positions), default=0.0)
+            cached = self._columns = (key, positions, [index for _, index in key], height)
+        return cached
 
     def ordered_placements(self) -> List[LayerPlacement]:
         """Return placements ordered according to the start corner preference."""
-        order = self.start_corner.upper()
-        x_reverse = "E" in order
-        y_reverse = "N" in order
-        return sorted(
-            self.placements,
-            key=lambda p: (
-                -p.position.y if y_reverse else p.position.y,
-                -p.position.x if x_reverse else p.position.x,
-                p.sequence_index,
-            ),
-        )
+        placements = self.placements
+        return [placements[idx] for idx in self._ordered_indices()]
 
     def describe_blocks(self) -> Sequence[str]:
-        return [f"{name}: {count}" for name, count in sorted(self.blocks.items())]
+        return list(self._block_descriptions)
+
+    def max_height(self) -> float:
+        """Return the highest z position of the layer (0.0 when empty)."""
+        return self._column_cache()[3]
+
+    def reset_cache(self) -> None:
+        """Drop cached values; call it after mutating ``blocks``."""
+        self._columns = None
+        self._order = None
+        self.__dict__.pop("_block_descriptions", None)
+
+    def _ordered_indices(self) -> Tuple[int, ...]:
+        positions = self.positions
+        order = self.start_corner.upper()
+        cached = self._order
+        if cached is None or cached[0] is not positions or cached[1] != order:
+            x_sign = -1.0 if "E" in order else 1.0
+            y_sign = -1.0 if "N" in order else 1.0
+            sequence = self.sequence_indices
+            indices = tuple(
+                sorted(
+                    range(len(positions)),
+                    key=lambda idx: (y_sign * positions[idx][1], x_sign * positions[idx][0], sequence[idx]),
+                )
+            )
+            cached = self._order = (positions, order, indices)
+        return cached[2]
+
+    @cached_property
+    def _block_descriptions(self) -> Tuple[str, ...]:
+        return tuple(f"{name}: {count}" for name, count in sorted(self.blocks.items()))
+
+
+_column_fields = attrgetter("position", "sequence_index")
 
 
 @dataclass
@@ -146,13 +199,7 @@ class LayerSequencePlan:
 
     def max_height(self) -> float:
         """Return the highest z position reached by the sequence."""
-        highest = 0.0
-        for layer in self.layers:
-            if not layer.placements:
-                continue
-            layer_height = max(placement.position.z for placement in layer.placements)
-            highest = max(highest, layer_height)
-        return highest
+        return max((0.0, *(layer.max_height() for layer in self.layers if layer.placements)))
 
 
 def ensure_positive(value: float, *, name: str) -> float:
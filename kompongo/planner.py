@@ -1,97 +1,147 @@
 """Recursive five-block planner implementation."""
 from __future__ import annotations
 
+from collections import Counter
+from dataclasses import dataclass
 from math import floor
-from typing import Dict, List, Tuple
+import sys
+from typing import Dict, Tuple
 
+from ._planner_kernels import BLOCK_NAMES, block_code, build_grid
 from .models import LayerPlan, LayerPlacement, LayerRequest, Vector3
 
 
+@dataclass(frozen=True)
+class _Layout:
+    """Request-independent geometry of a planned layer, shared through the planner cache."""
+
+    orientation: int
+    columns: int
+    rows: int
+    fill_ratio: float
+    usable_width: float
+    usable_depth: float
+    positions: Tuple[Tuple[float, float, float], ...]
+    codes: Tuple[int, ...]
+
+
 class RecursiveFiveBlockPlanner:
     """Build a layer by dividing the pallet into up to five rectangular blocks."""
 
+    # Number of distinct layouts remembered by ``plan_layer``.
+    cache_size = 32
+
     def __init__(self, tolerance: float = 1e-4):
         self.tolerance = tolerance
+        self._layouts: Dict[tuple, _Layout] = {}
 
     def plan_layer(self, request: LayerRequest) -> LayerPlan:
-        best_plan: LayerPlan | None = None
+        # The layout only depends on the numeric inputs: stacking levels or
+        # switching start corners reuses it and only rebuilds the placements.
+        key = (
+            request.pallet.dimensions,
+            request.overhang_x,
+            request.overhang_y,
+            request.box.dimensions,
+            tuple(request.allowed_orientations()),
+            request.pickup_offset.z,
+        )
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._best_layout(request)
+            if len(self._layouts) >= self.cache_size:
+                del self._layouts[next(iter(self._layouts))]
+            self._layouts[key] = layout
+        return self._build_plan(request, layout)
+
+    def _best_layout(self, request: LayerRequest) -> _Layout:
+        # Orientations are compared on the grid size alone (a few float operations
+        # each); placements are built only for the winner, so evaluating the
+        # candidates concurrently would cost more than it saves.
+        usable = self._usable_area(request)
+        best: Tuple[int, float] | None = None
         for orientation in request.allowed_orientations():
-            candidate = self._plan_orientation(request, orientation)
-            if not candidate.placements:
+            columns, rows, fill_ratio = self._grid_size(request, orientation, usable)
+            if columns == 0 or rows == 0:
                 continue
-            if best_plan is None or candidate.fill_ratio > best_plan.fill_ratio:
-                best_plan = candidate
-        if best_plan is None:
+            if best is None or fill_ratio > best[1]:
+                best = (orientation, fill_ratio)
+                if fill_ratio >= 1.0 - self.tolerance:
+                    break  # a full layer cannot be improved upon
+        if best is None:
             raise ValueError("Unable to generate a layer with the provided inputs")
-        return best_plan
+        return self._layout(request, best[0], usable)
 
-    def _plan_orientation(self, request: LayerRequest, orientation: int) -> LayerPlan:
+    def _usable_area(self, request: LayerRequest) -> Tuple[float, float]:
+        """Return the pallet surface including the allowed overhang on both sides."""
+        return (
+            request.pallet.dimensions.width + request.overhang_x * 2,
+            request.pallet.dimensions.depth + request.overhang_y * 2,
+        )
+
+    def _grid_size(
+        self,
+        request: LayerRequest,
+        orientation: int,
+        usable: Tuple[float, float],
+    ) -> Tuple[int, int, float]:
+        """Return columns, rows and fill ratio of the grid for ``orientation``."""
         box_dims = request.box.dimensions
         width = box_dims.width if orientation == 0 else box_dims.depth
         depth = box_dims.depth if orientation == 0 else box_dims.width
-
-        usable_width = request.pallet.dimensions.width + request.overhang_x * 2
-        usable_depth = request.pallet.dimensions.depth + request.overhang_y * 2
-
+        usable_width, usable_depth = usable
         columns = max(0, floor(usable_width / width))
         rows = max(0, floor(usable_depth / depth))
-        if columns == 0 or rows == 0:
-            return LayerPlan([], orientation, 0.0, {}, request.start_corner, {}, [], box=request.box)
-
-        placements: List[LayerPlacement] = []
-        total_boxes = columns * rows
-        fill_ratio = (total_boxes * width * depth) / (usable_width * usable_depth)
-        offsets = self._start_offsets(usable_width, usable_depth, width, depth, columns, rows)
-        seq = 0
-        block_counts: Dict[str, int] = {}
-        for row in range(rows):
-            for col in range(columns):
-                block_name = self._block_name(row, col, rows, columns)
-                block_counts[block_name] = block_counts.get(block_name, 0) + 1
-                x = offsets[0] + col * width + width / 2
-                y = offsets[1] + row * depth + depth / 2
-                placements.append(
-                    LayerPlacement(
-                        box_id=request.box.id,
-                        position=Vector3(x=x, y=y, z=request.pickup_offset.z),
-                        rotation=orientation,
-                        block=block_name,
-                        sequence_index=seq,
-                    )
-                )
-                seq += 1
+        fill_ratio = (columns * rows * width * depth) / (usable_width * usable_depth)
+        return columns, rows, fill_ratio
+
+    def _layout(self, request: LayerRequest, orientation: int, usable: Tuple[float, float]) -> _Layout:
+        box_dims = request.box.dimensions
+        width = box_dims.width if orientation == 0 else box_dims.depth
+        depth = box_dims.depth if orientation == 0 else box_dims.width
+        usable_width, usable_depth = usable
+
+        columns, rows, fill_ratio = self._grid_size(request, orientation, usable)
+        offset_x, offset_y = self._start_offsets(usable_width, usable_depth, width, depth, columns, rows)
+        positions, codes = build_grid(columns, rows, width, depth, offset_x, offset_y, request.pickup_offset.z)
+        return _Layout(
+            orientation,
+            columns,
+            rows,
+            fill_ratio,
+            usable_width,
+            usable_depth,
+            tuple(positions),
+            tuple(codes),
+        )
+
+    def _build_plan(self, request: LayerRequest, layout: _Layout) -> LayerPlan:
+        box_id = sys.intern(request.box.id)
+        placements = [
+            LayerPlacement(box_id, Vector3(x, y, z), layout.orientation, BLOCK_NAMES[code], index)
+            for index, ((x, y, z), code) in enumerate(zip(layout.positions, layout.codes))
+        ]
+        # Counter keeps first-seen order, so the block listing is unchanged.
+        block_counts: Dict[str, int] = {BLOCK_NAMES[code]: count for code, count in Counter(layout.codes).items()}
 
         metadata = {
-            "columns": str(columns),
-            "rows": str(rows),
-            "usable_width": f"{usable_width:.1f}",
-            "usable_depth": f"{usable_depth:.1f}",
+            "columns": str(layout.columns),
+            "rows": str(layout.rows),
+            "usable_width": f"{layout.usable_width:.1f}",
+            "usable_depth": f"{layout.usable_depth:.1f}",
         }
         return LayerPlan(
             placements,
-            orientation,
-            fill_ratio,
+            layout.orientation,
+            layout.fill_ratio,
             block_counts,
-            request.start_corner,
+            sys.intern(request.start_corner),
             metadata,
             box=request.box,
         )
 
     def _block_name(self, row: int, col: int, rows: int, columns: int) -> str:
-        is_left = col == 0
-        is_right = col == columns - 1
-        is_bottom = row == 0
-        is_top = row == rows - 1
-
-        if not (is_left or is_right or is_bottom or is_top):
-            return "center"
-        if is_left and not (is_top or is_bottom):
-            return "west"
-        if is_right and not (is_top or is_bottom):
-            return "east"
-        if is_bottom:
-            return "south"
-        return "north"
+        return BLOCK_NAMES[block_code(row, col, rows, columns)]
 
     def _start_offsets(
         self,
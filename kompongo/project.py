@@ -3,14 +3,26 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from io import TextIOWrapper
 import json
 from pathlib import Path
 from typing import Any
-from zipfile import ZipFile, BadZipFile
+from zipfile import ZIP_DEFLATED, ZipFile, BadZipFile
 
 from .exporter import PlanExporter
 from .models import Box, Dimensions, LayerPlan, LayerSequencePlan, Pallet, Tool
 
+try:  # pragma: no cover - optional accelerator
+    import orjson
+except ImportError:  # pragma: no cover - fallback to the standard library
+    orjson = None
+
+
+def _json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class PalletProject:
@@ -23,10 +35,14 @@ class PalletProject:
     tool: dict[str, Any]
     summary: dict[str, Any]
     metadata: dict[str, str] = field(default_factory=dict)
-    created_at: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    )
-    plan_payload: str = ""
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    plan_payload: bytes = b""
+
+    def __post_init__(self) -> None:
+        # The payload is kept as the UTF-8 bytes stored in the archive; text is
+        # still accepted for callers that build projects by hand.
+        if isinstance(self.plan_payload, str):
+            self.plan_payload = self.plan_payload.encode("utf-8")
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -41,7 +57,7 @@ class PalletProject:
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any], payload: str) -> "PalletProject":
+    def from_dict(cls, data: dict[str, Any], payload: bytes | str) -> "PalletProject":
         return cls(
             name=data["name"],
             plan_type=data["plan_type"],
@@ -56,7 +72,7 @@ class PalletProject:
 
     def plan_data(self) -> dict[str, Any]:
         """Return the JSON payload as dictionary."""
-        return json.loads(self.plan_payload)
+        return _json_loads(self.plan_payload)
 
 
 class ProjectArchiver:
@@ -75,7 +91,7 @@ class ProjectArchiver:
         tool: Tool,
         metadata: dict[str, str] | None = None,
     ) -> PalletProject:
-        payload = self.exporter.to_payload(plan).decode("utf-8")
+        payload = self.exporter.to_payload(plan)
         plan_type = "sequence" if isinstance(plan, LayerSequencePlan) else "layer"
         summary = self._summary(plan)
         project = PalletProject(
@@ -90,19 +106,33 @@ class ProjectArchiver:
         )
         return project
 
-    def save(self, project: PalletProject, target: str | Path) -> Path:
+    def save(self, project: PalletProject, target: str | Path, *, pretty: bool = False) -> Path:
+        """Write the project archive; ``pretty`` indents the metadata for manual inspection."""
         path = Path(target)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with ZipFile(path, "w") as archive:
-            archive.writestr("metadata.json", json.dumps(project.to_dict(), indent=2))
-            archive.writestr("plan.json", project.plan_payload)
+        # Entries are written straight onto the zip streams, without building the
+        # JSON text in memory before handing it to the archive.
+        # Level 1 deflate already shrinks the repetitive JSON several times over at
+        # roughly the cost of storing it uncompressed.
+        with ZipFile(path, "w", compression=ZIP_DEFLATED, compresslevel=1) as archive:
+            if orjson is not None:
+                with archive.open("metadata.json", "w") as handle:
+                    handle.write(orjson.dumps(project.to_dict(), option=orjson.OPT_INDENT_2 if pretty else None))
+            else:
+                with archive.open("metadata.json", "w") as handle, TextIOWrapper(handle, encoding="utf-8") as stream:
+                    if pretty:
+                        json.dump(project.to_dict(), stream, indent=2)
+                    else:
+                        json.dump(project.to_dict(), stream, separators=(",", ":"))
+            with archive.open("plan.json", "w") as handle:
+                handle.write(project.plan_payload)
         return path
 
     def load(self, archive_path: str | Path) -> PalletProject:
         try:
             with ZipFile(archive_path, "r") as archive:
-                metadata = json.loads(archive.read("metadata.json").decode("utf-8"))
-                payload = archive.read("plan.json").decode("utf-8")
+                metadata = _json_loads(archive.read("metadata.json"))
+                payload = archive.read("plan.json")
         except (FileNotFoundError, KeyError, BadZipFile) as exc:
             raise ValueError(f"Archivio non valido: {archive_path}") from exc
         return PalletProject.from_dict(metadata, payload)
@@ -114,12 +144,12 @@ class ProjectArchiver:
                 "total_boxes": plan.total_boxes(),
                 "max_height_mm": round(plan.max_height(), 3),
             }
-        placements = plan.placements
-        max_height = max((placement.position.z for placement in placements), default=0.0)
+        # The layer height comes from the plan's cached columns, which follow
+        # any edit made to the placements after planning.
         return {
             "layers": 1,
-            "total_boxes": len(placements),
-            "max_height_mm": round(max_height, 3),
+            "total_boxes": len(plan.placements),
+            "max_height_mm": round(plan.max_height(), 3),
         }
 
     def _pallet_payload(self, pallet: Pallet) -> dict[str, Any]:
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Sequence
+from types import MappingProxyType
+from typing import Mapping, Sequence
 
 from .collisions import CollisionChecker
 from .models import ApproachConfig, LayerPlan, LayerPlacement, LayerRequest, LayerSequencePlan, Vector3
@@ -23,7 +24,7 @@ class LayerSequencePlanner:
         corners: Sequence[str] | None = None,
         z_step: float | None = None,
         collision_checker: CollisionChecker | None = None,
-        approach_overrides: dict[str, ApproachConfig] | None = None,
+        approach_overrides: Mapping[str, ApproachConfig] | None = None,
     ) -> LayerSequencePlan:
         if levels <= 0:
             raise ValueError("levels must be a positive integer")
@@ -34,6 +35,7 @@ class LayerSequencePlanner:
         if not ordered_corners:
             ordered_corners = [request.start_corner]
 
+        shared_overrides = MappingProxyType(dict(approach_overrides)) if approach_overrides else None
         layers: list[LayerPlan] = []
         current_z = 0.0
         for level in range(levels):
@@ -63,7 +65,7 @@ class LayerSequencePlanner:
                 metadata={**plan.metadata, "level": str(level + 1), "z_offset": f"{current_z:.3f}"},
                 collisions=[],
                 box=plan.box,
-                approach_overrides=approach_overrides.copy() if approach_overrides else plan.approach_overrides.copy(),
+                approach_overrides=shared_overrides if shared_overrides is not None else plan.approach_overrides,
             )
             if collision_checker is not None:
                 issues = collision_checker.validate(level_plan, level_request)
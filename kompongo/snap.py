@@ -1,39 +1,61 @@
 """Snap point helpers."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
-from .models import LayerPlan, LayerPlacement, Vector3
+from .models import LayerPlan, Vector3
 
+_SNAP_NAMES: Tuple[str, ...] = ("center", "west", "east", "south", "north", "SW", "SE", "NW", "NE")
+# Offset of each snap point from the box centre, in half-box units, matching ``_SNAP_NAMES``.
+_SNAP_OFFSETS: Tuple[Tuple[int, int], ...] = (
+    (0, 0),
+    (-1, 0),
+    (1, 0),
+    (0, -1),
+    (0, 1),
+    (-1, -1),
+    (1, -1),
+    (-1, 1),
+    (1, 1),
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class SnapPoint:
     name: str
     position: Vector3
 
 
+class SnapPointTable(Mapping):
+    """Snap points of a layer keyed by sequence index.
+
+    Only the box centres are stored; ``SnapPoint`` objects are created when an
+    entry is read, while bulk consumers can use ``coordinates``.
+    """
+
+    def __init__(self, centers: Dict[int, Tuple[float, float, float]], half_width: float, half_depth: float) -> None:
+        self._centers = centers
+        # The box footprint is the same for the whole layer: scale the offsets once.
+        self._offsets = tuple((dx * half_width, dy * half_depth) for dx, dy in _SNAP_OFFSETS)
+
+    def __getitem__(self, index: int) -> List[SnapPoint]:
+        return [SnapPoint(name, Vector3(x, y, z)) for name, (x, y, z) in zip(_SNAP_NAMES, self.coordinates(index))]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._centers)
+
+    def __len__(self) -> int:
+        return len(self._centers)
+
+    def coordinates(self, index: int) -> List[Tuple[float, float, float]]:
+        """Return the nine snap coordinates of a placement, in ``_SNAP_NAMES`` order."""
+        x, y, z = self._centers[index]
+        return [(x + dx, y + dy, z) for dx, dy in self._offsets]
+
+
 class SnapPointGenerator:
-    def generate(self, plan: LayerPlan, box_width: float, box_depth: float) -> Dict[int, List[SnapPoint]]:
-        snap_points: Dict[int, List[SnapPoint]] = {}
-        for placement in plan.placements:
-            snap_points[placement.sequence_index] = self._placement_points(placement, box_width, box_depth)
-        return snap_points
-
-    def _placement_points(self, placement: LayerPlacement, box_width: float, box_depth: float) -> List[SnapPoint]:
-        x = placement.position.x
-        y = placement.position.y
-        z = placement.position.z
-        half_w = box_width / 2
-        half_d = box_depth / 2
-        return [
-            SnapPoint("center", Vector3(x, y, z)),
-            SnapPoint("west", Vector3(x - half_w, y, z)),
-            SnapPoint("east", Vector3(x + half_w, y, z)),
-            SnapPoint("south", Vector3(x, y - half_d, z)),
-            SnapPoint("north", Vector3(x, y + half_d, z)),
-            SnapPoint("SW", Vector3(x - half_w, y - half_d, z)),
-            SnapPoint("SE", Vector3(x + half_w, y - half_d, z)),
-            SnapPoint("NW", Vector3(x - half_w, y + half_d, z)),
-            SnapPoint("NE", Vector3(x + half_w, y + half_d, z)),
-        ]
+    def generate(self, plan: LayerPlan, box_width: float, box_depth: float) -> SnapPointTable:
+        centers = dict(zip(plan.sequence_indices, plan.positions))
+        return SnapPointTable(centers, box_width / 2, box_depth / 2)
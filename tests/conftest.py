@@ -0,0 +1,21 @@
+import pytest
+
+from verpal import DataRepository, LayerRequest
+
+
+@pytest.fixture(scope="session")
+def seeded_repo():
+    repo = DataRepository(in_memory=True)
+    repo.initialize("data/seed_data.json")
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def layer_request(seeded_repo):
+    return LayerRequest(
+        pallet=seeded_repo.get_pallet("EUR-EPAL"),
+        box=seeded_repo.get_box("BX-250"),
+        tool=seeded_repo.get_tool("TK-2"),
+        start_corner="SW",
+    )
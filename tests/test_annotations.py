@@ -57,3 +57,11 @@ def test_annotator_respects_overrides():
     assert annotation.approach_distance == 35
     # Side label should primarily shift along X
     assert annotation.label_position.x > plan.placements[0].position.x
+
+
+def test_iter_annotations_matches_annotate():
+    plan = build_plan()
+    annotator = PlacementAnnotator(label_offset=0.0)
+    assert list(annotator.iter_annotations(plan)) == annotator.annotate(plan)
+    plan.box = None
+    assert next(annotator.iter_annotations(plan), None) is None
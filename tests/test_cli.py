@@ -1,7 +1,10 @@
 import json
+import sqlite3
 from argparse import Namespace
 
-from verpal import DataRepository
+import pytest
+
+from verpal import DataRepository, Vector3
 import verpal.cli as cli
 
 
@@ -457,3 +460,32 @@ def test_run_render_creates_materials(tmp_path):
     assert "usemtl pallet" in obj_text
     assert "newmtl layer_1" in mtl_text
     assert "newmtl pallet" in mtl_text
+
+
+def test_calculate_layer_returns_independent_copies(layer_request):
+    first = cli._calculate_layer(layer_request)
+    first.placements[0].position = Vector3(0.0, 0.0, 0.0)
+    first.collisions.append("manual")
+    second = cli._calculate_layer(layer_request)
+    assert second.placements[0].position != first.placements[0].position
+    assert "manual" not in second.collisions
+    assert len(second.placements) == len(first.placements)
+
+
+def test_parser_rejects_invalid_axes(capsys):
+    parser = cli.build_parser()
+    args = parser.parse_args(["quote", "--pallet", "EUR-EPAL", "--box", "BX-250", "--axes", "ws"])
+    assert args.axes == "WS"
+    with pytest.raises(SystemExit):
+        parser.parse_args(["quote", "--pallet", "EUR-EPAL", "--box", "BX-250", "--axes", "NE"])
+    assert "Formato assi" in capsys.readouterr().err
+
+
+def test_get_repo_closes_evicted_repositories(tmp_path):
+    first = cli._get_repo(tmp_path / "first.db", "data/seed_data.json")
+    assert cli._get_repo(tmp_path / "first.db", "data/seed_data.json") is first
+    for index in range(cli._MAX_REPOS):
+        cli._get_repo(tmp_path / f"other-{index}.db", "data/seed_data.json")
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.list_pallets()
+    assert len(cli._REPOS) == cli._MAX_REPOS
@@ -1,6 +1,8 @@
+from dataclasses import replace
+
+import pytest
+
 from verpal import (
-    DataRepository,
-    LayerRequest,
     LayerSequencePlanner,
     RecursiveFiveBlockPlanner,
     ReferenceFrame,
@@ -8,25 +10,16 @@ from verpal import (
 from verpal.gui import build_layer_view_model, build_metric_summary, compute_height_report
 
 
-def _build_request(tmp_path):
-    db_path = tmp_path / "verpal.db"
-    repo = DataRepository(db_path)
-    repo.initialize("data/seed_data.json")
-    pallet = repo.get_pallet("EUR-EPAL")
-    box = repo.get_box("BX-250")
-    tool = repo.get_tool("TK-2")
-    repo.close()
-    return LayerRequest(
-        pallet=pallet,
-        box=box,
-        tool=tool,
-        start_corner="SW",
+@pytest.fixture
+def request_ne(layer_request):
+    return replace(
+        layer_request,
         reference_frame=ReferenceFrame(origin="NE", x_axis="W", y_axis="S"),
     )
 
 
-def test_build_layer_view_model_restores_positions(tmp_path):
-    request = _build_request(tmp_path)
+def test_build_layer_view_model_restores_positions(request_ne):
+    request = request_ne
     planner = RecursiveFiveBlockPlanner()
     plan = planner.plan_layer(request)
     view = build_layer_view_model(plan, request)
@@ -38,8 +31,8 @@ def test_build_layer_view_model_restores_positions(tmp_path):
         assert -request.overhang_y <= glyph.center.y <= request.pallet.dimensions.depth + request.overhang_y
 
 
-def test_compute_height_report_handles_sequence(tmp_path):
-    request = _build_request(tmp_path)
+def test_compute_height_report_handles_sequence(request_ne):
+    request = request_ne
     planner = LayerSequencePlanner()
     sequence = planner.stack_layers(request, levels=3, corners=["SW", "NE"], z_step=None)
     rows = compute_height_report(request, sequence.layers[0], sequence)
@@ -50,8 +43,8 @@ def test_compute_height_report_handles_sequence(tmp_path):
     assert abs(rows[-1].top - expected_total) < 1e-6
 
 
-def test_metric_summary_includes_sequence_data(tmp_path):
-    request = _build_request(tmp_path)
+def test_metric_summary_includes_sequence_data(request_ne):
+    request = request_ne
     sequence_planner = LayerSequencePlanner()
     sequence = sequence_planner.stack_layers(request, levels=2, corners=["SW"], z_step=None)
     lines = build_metric_summary(sequence.layers[0], sequence)
@@ -61,3 +54,22 @@ def test_metric_summary_includes_sequence_data(tmp_path):
     assert "Peso totale" in labels
     total_line = next(line for line in lines if line.label == "Peso totale")
     assert total_line.value.endswith("kg")
+
+
+def test_build_layer_view_model_reuses_until_plan_changes(request_ne):
+    request = request_ne
+    plan = RecursiveFiveBlockPlanner().plan_layer(request)
+    view = build_layer_view_model(plan, request)
+    assert build_layer_view_model(plan, request) is view
+    plan.mutate_positions(lambda position: replace(position, x=position.x + 1.0))
+    moved = build_layer_view_model(plan, request)
+    assert moved is not view
+    assert moved.placements[0].center.x != view.placements[0].center.x
+
+
+def test_layer_view_model_columns_match_glyphs(request_ne):
+    plan = RecursiveFiveBlockPlanner().plan_layer(request_ne)
+    view = build_layer_view_model(plan, request_ne)
+    assert len(view) == len(plan.placements)
+    assert view[len(view) - 1] == view.placements[-1]
+    assert list(view.widths) == [glyph.width for glyph in view.placements]
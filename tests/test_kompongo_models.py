@@ -0,0 +1,71 @@
+from dataclasses import replace
+
+from kompongo import (
+    Box,
+    CollisionChecker,
+    Dimensions,
+    LayerRequest,
+    LayerSequencePlanner,
+    Pallet,
+    RecursiveFiveBlockPlanner,
+    Tool,
+    Vector3,
+)
+
+
+def build_request() -> LayerRequest:
+    return LayerRequest(
+        pallet=Pallet(id="P", dimensions=Dimensions(1200, 800, 144), max_overhang_x=0, max_overhang_y=0),
+        box=Box(id="B", dimensions=Dimensions(400, 200, 200), weight=5.0, label_position="front"),
+        tool=Tool(id="T", name="Tool", max_boxes=2, allowed_orientations=(0, 90)),
+    )
+
+
+def test_reset_cache_rebuilds_columns_after_mutation():
+    request = build_request()
+    plan = RecursiveFiveBlockPlanner().plan_layer(request)
+    checker = CollisionChecker()
+    assert plan.max_height() == 0.0
+    assert not checker.validate(plan, request)
+
+    plan.placements[0].position = Vector3(5000, 5000, 900)
+    plan.reset_cache()
+
+    assert plan.max_height() == 900
+    descriptions = [collision.description for collision in checker.validate(plan, request)]
+    assert "Box 0 exceeds pallet width limits" in descriptions
+
+
+def test_direct_position_edit_refreshes_cached_columns():
+    request = build_request()
+    plan = RecursiveFiveBlockPlanner().plan_layer(request)
+    checker = CollisionChecker()
+    assert not checker.validate(plan, request)
+
+    first = plan.placements[0]
+    plan.placements.append(replace(first, sequence_index=len(plan.placements)))
+    descriptions = [collision.description for collision in checker.validate(plan, request)]
+    assert descriptions == [f"Collision between {first.sequence_index} and {len(plan.placements) - 1}"]
+
+    plan.placements.pop()
+    plan.placements[0].position = Vector3(99999, 0, 0)
+    descriptions = [collision.description for collision in checker.validate(plan, request)]
+    assert "Box 0 exceeds pallet width limits" in descriptions
+    assert "Box 0 exceeds pallet depth limits" in descriptions
+
+    plan.placements[1].position = Vector3(0, 99999, 0)
+    assert plan.ordered_placements()[-1] is plan.placements[1]
+
+
+def test_max_height_follows_placement_edits():
+    request = build_request()
+    plan = RecursiveFiveBlockPlanner().plan_layer(request)
+    sequence = LayerSequencePlanner().stack_layers(request, levels=2)
+    assert plan.max_height() == 0.0
+
+    plan.placements[0].position = Vector3(0, 0, 999)
+    assert plan.max_height() == 999
+
+    top = sequence.layers[-1]
+    top.placements[0].position = Vector3(0, 0, 5000)
+    assert sequence.max_height() == 5000
@@ -72,3 +72,14 @@ def test_compute_sequence_metrics():
     assert metrics.total_weight == 20.5
     assert metrics.center_of_mass.z == 51.5
     assert metrics.max_height == 103.0
+
+
+def test_layer_arrays_follow_position_updates():
+    plan = _build_layer()
+    arrays = plan.as_arrays()
+    assert list(arrays.x) == [100.0, 300.0]
+    assert plan.as_arrays() is arrays
+
+    plan.mutate_positions(lambda position: Vector3(position.x, position.y, position.z + 10.0))
+    assert list(plan.as_arrays().z) == [35.0, 35.0]
+    assert compute_layer_metrics(plan).center_of_mass.z == 35.0
@@ -1,45 +1,29 @@
+from dataclasses import replace
+
 from verpal import (
     CollisionChecker,
-    DataRepository,
-    LayerRequest,
     RecursiveFiveBlockPlanner,
     ReferenceFrame,
+    Vector3,
 )
+from verpal.metrics import compute_layer_metrics
 
 
-def test_planner_generates_layer(tmp_path):
-    db_path = tmp_path / "verpal.db"
-    repo = DataRepository(db_path)
-    repo.initialize("data/seed_data.json")
-    pallet = repo.get_pallet("EUR-EPAL")
-    box = repo.get_box("BX-250")
-    tool = repo.get_tool("TK-2")
-    request = LayerRequest(pallet=pallet, box=box, tool=tool, start_corner="SW")
+def test_planner_generates_layer(layer_request):
     planner = RecursiveFiveBlockPlanner()
-    plan = planner.plan_layer(request)
+    plan = planner.plan_layer(layer_request)
     assert len(plan.placements) > 0
-    collisions = CollisionChecker().validate(plan, request)
+    collisions = CollisionChecker().validate(plan, layer_request)
     assert not collisions
-    repo.close()
 
 
-def test_reference_frame_transformation(tmp_path):
-    db_path = tmp_path / "verpal.db"
-    repo = DataRepository(db_path)
-    repo.initialize("data/seed_data.json")
-    pallet = repo.get_pallet("EUR-EPAL")
-    box = repo.get_box("BX-250")
-    tool = repo.get_tool("TK-2")
+def test_reference_frame_transformation(layer_request):
     planner = RecursiveFiveBlockPlanner()
 
-    default_request = LayerRequest(pallet=pallet, box=box, tool=tool, start_corner="SW")
-    default_plan = planner.plan_layer(default_request)
+    default_plan = planner.plan_layer(layer_request)
 
-    custom_request = LayerRequest(
-        pallet=pallet,
-        box=box,
-        tool=tool,
-        start_corner="SW",
+    custom_request = replace(
+        layer_request,
         reference_frame=ReferenceFrame(origin="NE", x_axis="W", y_axis="S"),
     )
     custom_plan = planner.plan_layer(custom_request)
@@ -49,4 +33,23 @@ def test_reference_frame_transformation(tmp_path):
     assert custom_plan.metadata["reference_axes"] == "WS"
     assert default_plan.placements[0].position.x != custom_plan.placements[0].position.x
     assert default_plan.placements[0].position.y != custom_plan.placements[0].position.y
-    repo.close()
+
+
+def test_collision_checker_reports_overlapping_boxes(layer_request):
+    plan = RecursiveFiveBlockPlanner().plan_layer(layer_request)
+    first = plan.placements[0]
+    plan.placements.append(replace(first, sequence_index=len(plan.placements)))
+    collisions = [c.description for c in CollisionChecker().validate(plan, layer_request)]
+    assert collisions == [f"Collision between {first.sequence_index} and {len(plan.placements) - 1}"]
+
+
+def test_direct_position_edit_refreshes_cached_columns(layer_request):
+    plan = RecursiveFiveBlockPlanner().plan_layer(layer_request)
+    checker = CollisionChecker()
+    compute_layer_metrics(plan)
+    assert not checker.validate(plan, layer_request)
+
+    plan.placements[0].position = Vector3(99999, 99999, 5000)
+    assert compute_layer_metrics(plan).max_height == 5000 + layer_request.box.dimensions.height
+    descriptions = [c.description for c in checker.validate(plan, layer_request)]
+    assert any("exceeds pallet" in description for description in descriptions)
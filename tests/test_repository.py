@@ -1,3 +1,6 @@
+import json
+from pathlib import Path
+
 from verpal import DataRepository
 
 
@@ -33,3 +36,64 @@ def test_repository_interleaves(tmp_path):
     catalog = repo.list_interleaves()
     assert len(catalog) == 2
     repo.close()
+
+
+def test_repository_initialize_is_idempotent(tmp_path):
+    db_path = tmp_path / "verpal.db"
+    repo = DataRepository(db_path)
+    repo.initialize("data/seed_data.json")
+    repo.initialize("data/seed_data.json")
+    repo.close()
+
+    reopened = DataRepository(db_path)
+    reopened.initialize("data/seed_data.json")
+    assert len(reopened.list_pallets()) == 2
+    assert len(reopened.list_interleaves()) == 2
+    reopened.close()
+
+
+def test_repository_in_memory():
+    repo = DataRepository(in_memory=True)
+    repo.initialize("data/seed_data.json")
+    assert repo.in_memory
+    assert repo.get_box("BX-250").weight == 7.3
+    repo.close()
+
+
+def test_repository_reuses_catalog_instances():
+    repo = DataRepository(in_memory=True)
+    repo.initialize("data/seed_data.json")
+    interleaf = repo.get_interleaf("IL-CARTON")
+    assert repo.get_interleaf("IL-CARTON") is interleaf
+    assert interleaf in repo.list_interleaves()
+    assert repo.list_boxes()[0] is repo.get_box("BX-250")
+    repo.close()
+
+
+def test_repository_reparses_changed_seed(tmp_path):
+    seed = json.loads(Path("data/seed_data.json").read_text())
+    seed_path = tmp_path / "seed.json"
+    seed_path.write_text(json.dumps(seed))
+    repo = DataRepository(in_memory=True)
+    repo.initialize(seed_path)
+    assert len(repo.list_pallets()) == 2
+    repo.close()
+
+    db_path = tmp_path / "verpal.db"
+    repo = DataRepository(db_path)
+    repo.initialize(seed_path)
+    repo.close()
+
+    seed["pallets"].append(dict(seed["pallets"][0], id="EUR-COPY"))
+    seed_path.write_text(json.dumps(seed))
+    repo = DataRepository(in_memory=True)
+    repo.initialize(seed_path)
+    assert repo.get_pallet("EUR-COPY").dimensions.width == 1200
+    repo.close()
+
+    # Reopening the already populated file database must pick up the change.
+    repo = DataRepository(db_path)
+    repo.initialize(seed_path)
+    assert repo.get_pallet("EUR-COPY").dimensions.width == 1200
+    assert len(repo.list_pallets()) == 3
+    repo.close()
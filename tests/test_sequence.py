@@ -1,24 +1,15 @@
+from dataclasses import replace
+
 from verpal import (
     CollisionChecker,
-    DataRepository,
-    LayerRequest,
     LayerSequencePlanner,
     ReferenceFrame,
 )
 
 
-def test_sequence_planner_stacks_layers(tmp_path):
-    db_path = tmp_path / "verpal.db"
-    repo = DataRepository(db_path)
-    repo.initialize("data/seed_data.json")
-    pallet = repo.get_pallet("EUR-EPAL")
-    box = repo.get_box("BX-250")
-    tool = repo.get_tool("TK-2")
-    request = LayerRequest(
-        pallet=pallet,
-        box=box,
-        tool=tool,
-        start_corner="SW",
+def test_sequence_planner_stacks_layers(layer_request):
+    request = replace(
+        layer_request,
         reference_frame=ReferenceFrame(origin="CENTER", x_axis="W", y_axis="N"),
     )
 
@@ -41,24 +32,10 @@ def test_sequence_planner_stacks_layers(tmp_path):
     for layer in sequence.layers:
         assert not layer.collisions
 
-    repo.close()
-
 
-def test_sequence_planner_with_interleaf(tmp_path):
-    db_path = tmp_path / "verpal.db"
-    repo = DataRepository(db_path)
-    repo.initialize("data/seed_data.json")
-    pallet = repo.get_pallet("EUR-EPAL")
-    box = repo.get_box("BX-250")
-    tool = repo.get_tool("TK-2")
-    interleaf = repo.get_interleaf("IL-CARTON")
-    request = LayerRequest(
-        pallet=pallet,
-        box=box,
-        tool=tool,
-        start_corner="SW",
-        reference_frame=ReferenceFrame(),
-    )
+def test_sequence_planner_with_interleaf(seeded_repo, layer_request):
+    interleaf = seeded_repo.get_interleaf("IL-CARTON")
+    request = layer_request
 
     planner = LayerSequencePlanner()
     sequence = planner.stack_layers(
@@ -72,4 +49,3 @@ def test_sequence_planner_with_interleaf(tmp_path):
     assert sequence.interleaves[0].level == 1
     assert sequence.interleaves[0].interleaf.id == "IL-CARTON"
     assert sequence.layers[1].placements[0].position.z > sequence.layers[0].placements[0].position.z
-    repo.close()
@@ -0,0 +1,44 @@
+"""Uniform-grid broadphase shared by the box and gripper finger checks."""
+from __future__ import annotations
+
+from math import floor
+from typing import Callable, List, Sequence
+
+
+def grid_pairs(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    cell_x: float,
+    cell_y: float,
+    overlaps: Callable[[int, int], bool],
+) -> List[tuple[int, int]]:
+    """Return the sorted ``(i, j)`` pairs of nearby items accepted by ``overlaps``.
+
+    Centres are bucketed on a grid of ``cell_x`` by ``cell_y`` cells, so any
+    two items closer than one cell on both axes sit in the same or in adjacent
+    cells. Each cell is paired with itself and its four forward neighbours
+    only, which visits every adjacent cell pair exactly once.
+    """
+    buckets: dict[tuple[int, int], List[int]] = {}
+    for index, (x, y) in enumerate(zip(xs, ys)):
+        buckets.setdefault((floor(x / cell_x), floor(y / cell_y)), []).append(index)
+    pairs: List[tuple[int, int]] = []
+    append = pairs.append
+    neighbour_bucket = buckets.get
+    for (bucket_x, bucket_y), members in buckets.items():
+        for offset, first in enumerate(members):
+            for second in members[offset + 1 :]:
+                if overlaps(first, second):
+                    append((first, second))
+            for step_x, step_y in _FORWARD_NEIGHBOURS:
+                bucket = neighbour_bucket((bucket_x + step_x, bucket_y + step_y))
+                if bucket is None:
+                    continue
+                for second in bucket:
+                    if overlaps(first, second):
+                        append((first, second) if first < second else (second, first))
+    pairs.sort()
+    return pairs
+
+
+_FORWARD_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
@@ -3,9 +3,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from math import cos, radians, sin
-from typing import Dict
+from typing import Dict, Iterator
 
-from .models import Box, LayerPlan, LayerPlacement, Vector3
+from .models import Box, LayerPlan, Vector3
 from .models import ensure_positive
 
 
@@ -29,78 +29,76 @@ class PlacementAnnotator:
         self.label_offset = label_offset
 
     def annotate(self, plan: LayerPlan) -> list[PlacementAnnotation]:
+        return list(self.iter_annotations(plan))
+
+    def iter_annotations(self, plan: LayerPlan) -> Iterator[PlacementAnnotation]:
+        """Yield annotations lazily, in placement order."""
+
         if not plan.placements or plan.box is None:
-            return []
-        annotations: list[PlacementAnnotation] = []
+            return
         direction = plan.metadata.get("approach_direction", plan.start_corner)
         distance = float(plan.metadata.get("approach_distance", self.default_approach))
-        for placement in plan.placements:
-            override = (
-                plan.approach_overrides.get(placement.block.lower())
-                if plan.approach_overrides
-                else None
+        box = plan.box
+        label_face = box.label_position
+        arrays = plan.as_arrays()
+        # Label offsets only depend on the rotation and approaches only on the
+        # block, so both are resolved once per distinct value.
+        local = _face_vector(box, label_face, self.label_offset)
+        offsets = {rotation: _rotate_vector(local, rotation) for rotation in set(arrays.rotation)}
+        overrides = plan.approach_overrides
+        # block -> (approach_direction, approach_vector, approach_distance)
+        approaches: Dict[str, tuple[str, Vector3, float]] = {}
+        for block in set(arrays.block):
+            override = overrides.get(block.lower()) if overrides else None
+            approaches[block] = self._resolve_approach(
+                override.direction if override else direction,
+                override.distance if override else distance,
             )
-            annotation = self._annotate_single(
-                placement,
-                plan.box,
-                direction=override.direction if override else direction,
-                distance=override.distance if override else distance,
-                label_face=plan.box.label_position,
+        for sequence_index, x, y, z, offset, approach in zip(
+            arrays.sequence_index,
+            arrays.x,
+            arrays.y,
+            arrays.z,
+            map(offsets.__getitem__, arrays.rotation),
+            map(approaches.__getitem__, arrays.block),
+        ):
+            yield PlacementAnnotation(
+                sequence_index,
+                Vector3(x=x + offset.x, y=y + offset.y, z=z + offset.z),
+                label_face,
+                *approach,
             )
-            annotations.append(annotation)
-        return annotations
-
-    def _annotate_single(
-        self,
-        placement: LayerPlacement,
-        box: Box,
-        *,
-        direction: str,
-        distance: float,
-        label_face: str,
-    ) -> PlacementAnnotation:
+
+    def _resolve_approach(self, direction: str, distance: float) -> tuple[str, Vector3, float]:
         ensure_positive(distance, name="approach_distance")
         sanitized_direction = direction.strip().upper() or "N"
-        approach_vector = self._direction_to_vector(sanitized_direction, distance)
-        label_position = self._label_world_position(placement, box, label_face)
-        return PlacementAnnotation(
-            placement_index=placement.sequence_index,
-            label_position=label_position,
-            label_face=label_face,
-            approach_direction=sanitized_direction,
-            approach_vector=approach_vector,
-            approach_distance=distance,
-        )
+        return sanitized_direction, self._direction_to_vector(sanitized_direction, distance), distance
 
     def _direction_to_vector(self, direction: str, distance: float) -> Vector3:
         normalized = direction.strip().upper() or "N"
         dx, dy = _resolve_direction(normalized)
         return Vector3(x=dx * distance, y=dy * distance, z=0.0)
 
-    def _label_world_position(self, placement: LayerPlacement, box: Box, face: str) -> Vector3:
-        local = _face_vector(box, face, self.label_offset)
-        rotated = _rotate_vector(local, placement.rotation)
-        return Vector3(
-            x=placement.position.x + rotated.x,
-            y=placement.position.y + rotated.y,
-            z=placement.position.z + rotated.z,
-        )
+
+_DIAGONAL = 0.7071
+
+_DIRECTIONS: Dict[str, tuple[float, float]] = {
+    "N": (0.0, 1.0),
+    "S": (0.0, -1.0),
+    "E": (1.0, 0.0),
+    "W": (-1.0, 0.0),
+    "NE": (_DIAGONAL, _DIAGONAL),
+    "NW": (-_DIAGONAL, _DIAGONAL),
+    "SE": (_DIAGONAL, -_DIAGONAL),
+    "SW": (-_DIAGONAL, -_DIAGONAL),
+}
 
 
 def _resolve_direction(tag: str) -> tuple[float, float]:
-    directions: Dict[str, tuple[float, float]] = {
-        "N": (0.0, 1.0),
-        "S": (0.0, -1.0),
-        "E": (1.0, 0.0),
-        "W": (-1.0, 0.0),
-        "NE": (0.7071, 0.7071),
-        "NW": (-0.7071, 0.7071),
-        "SE": (0.7071, -0.7071),
-        "SW": (-0.7071, -0.7071),
-    }
-    if tag not in directions:
-        raise ValueError(f"Unsupported approach direction '{tag}'")
-    return directions[tag]
+    try:
+        return _DIRECTIONS[tag]
+    except KeyError:
+        raise ValueError(f"Unsupported approach direction '{tag}'") from None
 
 
 def _face_vector(box: Box, face: str, label_offset: float) -> Vector3:
@@ -1,11 +1,12 @@
 """Approach helpers shared between CLI and GUI."""
 from __future__ import annotations
 
-import re
 from typing import Dict, Sequence
 
 from .models import ApproachConfig, LayerPlan
 
+_SEPARATORS = str.maketrans(";,", "  ")
+
 
 def parse_approach_overrides(raw: Sequence[str] | str | None) -> Dict[str, ApproachConfig]:
     """Parse block-level approach overrides from CLI or GUI inputs."""
@@ -14,8 +15,7 @@ def parse_approach_overrides(raw: Sequence[str] | str | None) -> Dict[str, Appro
     if raw is None:
         values = []
     elif isinstance(raw, str):
-        tokens = re.split(r"[;,\s]+", raw.strip())
-        values = [token for token in tokens if token]
+        values = raw.translate(_SEPARATORS).split()
     else:
         values = list(raw)
     overrides: Dict[str, ApproachConfig] = {}
@@ -44,7 +44,7 @@ def apply_approach(
 
     plan.metadata["approach_direction"] = direction
     plan.metadata["approach_distance"] = f"{distance:.2f}"
-    plan.approach_overrides = overrides.copy()
+    plan.approach_overrides = {block.lower(): config for block, config in overrides.items()}
 
 
 __all__ = ["parse_approach_overrides", "apply_approach"]
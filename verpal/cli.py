@@ -2,17 +2,17 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import json
+import sys
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterator, NamedTuple
 
 from .approach import apply_approach, parse_approach_overrides
-
-from .annotations import PlacementAnnotator
-from .collisions import CollisionChecker
-from .exporter import PlanExporter
-from .metrics import compute_layer_metrics, compute_sequence_metrics
 from .models import (
+    ApproachConfig,
     Box,
     Dimensions,
     Interleaf,
@@ -21,22 +21,16 @@ from .models import (
     LayerRequest,
     Pallet,
     ReferenceFrame,
+    Tool,
     Vector3,
 )
-from .plc import SiemensPLCExporter
-from .planner import RecursiveFiveBlockPlanner
-from .project import ProjectArchiver
 from .quote import build_quote_report
-from .render3d import export_sequence_to_obj, list_color_palettes
 from .repository import DataRepository
-from .sequence import LayerSequencePlanner
-from .snap import SnapPointGenerator
 from .gripper import (
     MultiGripDefinition,
     build_layout,
     detect_finger_collisions,
-    evaluate_envelope,
-    evaluate_tool_clearance,
+    evaluate_gripper_constraints,
 )
 from .viewer import (
     VirtualCamera,
@@ -46,7 +40,12 @@ from .viewer import (
     summarize_metrics,
 )
 
+if TYPE_CHECKING:
+    from .collisions import CollisionChecker
+    from .sequence import LayerSequencePlanner
+
 
+@lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="VerPal planner")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -59,30 +58,9 @@ def build_parser() -> argparse.ArgumentParser:
     _add_reference_args(plan_parser)
     _add_pallet_override_args(plan_parser)
     _add_box_override_args(plan_parser)
-    plan_parser.add_argument("--db", default="verpal.db", help="Database path")
-    plan_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(plan_parser)
     plan_parser.add_argument("--export", help="Output filename")
-    plan_parser.add_argument(
-        "--approach-distance",
-        type=float,
-        default=75.0,
-        help="Ampiezza (mm) del vettore di accostamento",
-    )
-    plan_parser.add_argument(
-        "--approach-direction",
-        help="Direzione di accostamento (N, S, E, W, NE, NW, SE, SW)",
-    )
-    plan_parser.add_argument(
-        "--approach-override",
-        action="append",
-        help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
-    )
-    plan_parser.add_argument(
-        "--label-offset",
-        type=float,
-        default=5.0,
-        help="Offset della posizione etichetta rispetto al lato della scatola",
-    )
+    _add_approach_args(plan_parser)
 
     stack_parser = sub.add_parser("stack", help="Compute a multi-layer pallet")
     stack_parser.add_argument("--pallet", required=True, help="Pallet id")
@@ -96,30 +74,9 @@ def build_parser() -> argparse.ArgumentParser:
     stack_parser.add_argument("--layers", type=int, default=2, help="Number of layers to stack")
     stack_parser.add_argument("--z-step", type=float, help="Custom Z increment between layers")
     _add_interleaf_args(stack_parser)
-    stack_parser.add_argument("--db", default="verpal.db", help="Database path")
-    stack_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(stack_parser)
     stack_parser.add_argument("--export", help="Output filename")
-    stack_parser.add_argument(
-        "--approach-distance",
-        type=float,
-        default=75.0,
-        help="Ampiezza (mm) del vettore di accostamento",
-    )
-    stack_parser.add_argument(
-        "--approach-direction",
-        help="Direzione di accostamento (N, S, E, W, NE, NW, SE, SW)",
-    )
-    stack_parser.add_argument(
-        "--approach-override",
-        action="append",
-        help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
-    )
-    stack_parser.add_argument(
-        "--label-offset",
-        type=float,
-        default=5.0,
-        help="Offset della posizione etichetta rispetto al lato della scatola",
-    )
+    _add_approach_args(stack_parser)
 
     archive_parser = sub.add_parser("archive", help="Crea un archivio completo del progetto")
     archive_parser.add_argument("--name", default="VerPal Project", help="Nome progetto")
@@ -134,30 +91,9 @@ def build_parser() -> argparse.ArgumentParser:
     archive_parser.add_argument("--layers", type=int, default=1, help="Numero di strati")
     archive_parser.add_argument("--z-step", type=float, help="Incremento Z personalizzato tra gli strati")
     _add_interleaf_args(archive_parser)
-    archive_parser.add_argument("--db", default="verpal.db", help="Database path")
-    archive_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(archive_parser)
     archive_parser.add_argument("--archive", required=True, help="File di output (.zip)")
-    archive_parser.add_argument(
-        "--approach-distance",
-        type=float,
-        default=75.0,
-        help="Ampiezza (mm) del vettore di accostamento",
-    )
-    archive_parser.add_argument(
-        "--approach-direction",
-        help="Direzione di accostamento (N, S, E, W, NE, NW, SE, SW)",
-    )
-    archive_parser.add_argument(
-        "--approach-override",
-        action="append",
-        help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
-    )
-    archive_parser.add_argument(
-        "--label-offset",
-        type=float,
-        default=5.0,
-        help="Offset della posizione etichetta rispetto al lato della scatola",
-    )
+    _add_approach_args(archive_parser)
     archive_parser.add_argument(
         "--note",
         action="append",
@@ -171,12 +107,7 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["pallets", "boxes", "tools", "interleaves"],
         help="Tipo di dati da mostrare",
     )
-    catalog_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    catalog_parser.add_argument(
-        "--seed",
-        default="data/seed_data.json",
-        help="Seed data path (crea il db se necessario)",
-    )
+    _add_db_args(catalog_parser)
     catalog_parser.add_argument(
         "--format",
         choices=["table", "json"],
@@ -208,8 +139,7 @@ def build_parser() -> argparse.ArgumentParser:
         default="table",
         help="Formato di output",
     )
-    quote_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    quote_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(quote_parser)
 
     grip_parser = sub.add_parser(
         "grip",
@@ -260,8 +190,7 @@ def build_parser() -> argparse.ArgumentParser:
         default="table",
         help="Formato di output",
     )
-    grip_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    grip_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(grip_parser)
 
     viewer_parser = sub.add_parser(
         "viewer",
@@ -304,32 +233,11 @@ def build_parser() -> argparse.ArgumentParser:
         help="Variazione raggio camera (mm)",
     )
     viewer_parser.add_argument("--snap", action="store_true", help="Mostra il conteggio degli snap point")
-    viewer_parser.add_argument(
-        "--approach-distance",
-        type=float,
-        default=75.0,
-        help="Ampiezza vettore di accostamento di default",
-    )
-    viewer_parser.add_argument(
-        "--approach-direction",
-        help="Direzione di accostamento predefinita",
-    )
-    viewer_parser.add_argument(
-        "--approach-override",
-        action="append",
-        help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
-    )
-    viewer_parser.add_argument(
-        "--label-offset",
-        type=float,
-        default=5.0,
-        help="Offset etichetta per la vista 3D",
-    )
+    _add_approach_args(viewer_parser)
     _add_reference_args(viewer_parser)
     _add_pallet_override_args(viewer_parser)
     _add_box_override_args(viewer_parser)
-    viewer_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    viewer_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(viewer_parser)
 
     render_parser = sub.add_parser(
         "render",
@@ -360,7 +268,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     render_parser.add_argument(
         "--palette",
-        choices=list_color_palettes(),
+        type=_palette_type,
         default="classic",
         help="Palette colori da utilizzare per i layer",
     )
@@ -373,8 +281,7 @@ def build_parser() -> argparse.ArgumentParser:
     _add_pallet_override_args(render_parser)
     _add_box_override_args(render_parser)
     _add_interleaf_args(render_parser)
-    render_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    render_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(render_parser)
 
     gui_parser = sub.add_parser(
         "gui",
@@ -400,29 +307,8 @@ def build_parser() -> argparse.ArgumentParser:
     _add_pallet_override_args(gui_parser)
     _add_box_override_args(gui_parser)
     _add_interleaf_args(gui_parser)
-    gui_parser.add_argument(
-        "--approach-distance",
-        type=float,
-        default=75.0,
-        help="Ampiezza (mm) del vettore di accostamento predefinito",
-    )
-    gui_parser.add_argument(
-        "--approach-direction",
-        help="Direzione di accostamento fissa (lascia vuoto per seguire il corner)",
-    )
-    gui_parser.add_argument(
-        "--approach-override",
-        action="append",
-        help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
-    )
-    gui_parser.add_argument(
-        "--label-offset",
-        type=float,
-        default=5.0,
-        help="Offset etichetta rispetto al lato della scatola",
-    )
-    gui_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    gui_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_approach_args(gui_parser)
+    _add_db_args(gui_parser)
 
     analyze_parser = sub.add_parser(
         "analyze",
@@ -439,8 +325,7 @@ def build_parser() -> argparse.ArgumentParser:
     _add_pallet_override_args(analyze_parser)
     _add_box_override_args(analyze_parser)
     _add_interleaf_args(analyze_parser)
-    analyze_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    analyze_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
+    _add_db_args(analyze_parser)
 
     plc_parser = sub.add_parser(
         "plc",
@@ -458,43 +343,56 @@ def build_parser() -> argparse.ArgumentParser:
     _add_box_override_args(plc_parser)
     _add_interleaf_args(plc_parser)
     plc_parser.add_argument("--target", required=True, help="File di destinazione (es. packet.s7)")
-    plc_parser.add_argument("--db", default="verpal.db", help="Percorso database")
-    plc_parser.add_argument("--seed", default="data/seed_data.json", help="Seed data path")
-    plc_parser.add_argument(
+    _add_db_args(plc_parser)
+    _add_approach_args(plc_parser)
+    return parser
+
+
+def _add_reference_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--origin",
+        default="SW",
+        help="Origine del sistema di riferimento (SW, SE, NW, NE, CENTER)",
+    )
+    parser.add_argument(
+        "--axes",
+        type=_axes_type,
+        default="EN",
+        help="Orientamento assi (X: E/W, Y: N/S es. EN, ES, WN, WS)",
+    )
+
+
+def _add_db_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--db", default="verpal.db", help="Percorso database")
+    parser.add_argument(
+        "--seed",
+        default="data/seed_data.json",
+        help="Seed data path (crea il db se necessario)",
+    )
+
+
+def _add_approach_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
         "--approach-distance",
         type=float,
         default=75.0,
         help="Ampiezza (mm) del vettore di accostamento",
     )
-    plc_parser.add_argument(
+    parser.add_argument(
         "--approach-direction",
-        help="Direzione di accostamento (N, S, E, W, NE, NW, SE, SW)",
+        help="Direzione di accostamento (N, S, E, W, NE, NW, SE, SW); vuoto per seguire il corner",
     )
-    plc_parser.add_argument(
+    parser.add_argument(
         "--approach-override",
         action="append",
         help="Override blocchi nel formato blocco=DIREZIONE:DISTANZA",
     )
-    plc_parser.add_argument(
+    parser.add_argument(
         "--label-offset",
         type=float,
         default=5.0,
         help="Offset della posizione etichetta rispetto al lato della scatola",
     )
-    return parser
-
-
-def _add_reference_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument(
-        "--origin",
-        default="SW",
-        help="Origine del sistema di riferimento (SW, SE, NW, NE, CENTER)",
-    )
-    parser.add_argument(
-        "--axes",
-        default="EN",
-        help="Orientamento assi (X: E/W, Y: N/S es. EN, ES, WN, WS)",
-    )
 
 
 def _add_pallet_override_args(parser: argparse.ArgumentParser) -> None:
@@ -523,38 +421,90 @@ def _add_interleaf_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _get_repo(db: str | Path, seed: str | Path) -> DataRepository:
+    """Return the process-wide repository for ``db`` seeded from ``seed``.
+
+    Paths are resolved first so spellings like ``data/seed.json`` and
+    ``./data/seed.json`` share one connection and one seed parse.
+    """
+
+    db_key = str(db) if str(db) == ":memory:" else str(Path(db).resolve())
+    return _open_repo(db_key, str(Path(seed).resolve()))
+
+
+# Open repositories by (db, seed), least recently used first. Evicted entries
+# are closed straight away; the rest are closed by one exit hook.
+_REPOS: dict[tuple[str, str], DataRepository] = {}
+_MAX_REPOS = 4
+
+
+def _open_repo(db: str, seed: str) -> DataRepository:
+    key = (db, seed)
+    repo = _REPOS.pop(key, None)
+    if repo is None:
+        repo = DataRepository(db)
+        repo.initialize(seed)
+        if len(_REPOS) >= _MAX_REPOS:
+            _REPOS.pop(next(iter(_REPOS))).close()
+    _REPOS[key] = repo
+    return repo
+
+
+@atexit.register
+def _close_repos() -> None:
+    while _REPOS:
+        _REPOS.popitem()[1].close()
+
+
 def _resolve_pallet(repo: DataRepository, args: argparse.Namespace) -> Pallet:
     pallet = repo.get_pallet(args.pallet)
-    width = _positive_value(getattr(args, "pallet_width", None), pallet.dimensions.width, "pallet_width")
-    depth = _positive_value(getattr(args, "pallet_depth", None), pallet.dimensions.depth, "pallet_depth")
-    height = _positive_value(getattr(args, "pallet_height", None), pallet.dimensions.height, "pallet_height")
-    overhang_x = _non_negative_value(getattr(args, "overhang_x", None), pallet.max_overhang_x, "overhang_x")
-    overhang_y = _non_negative_value(getattr(args, "overhang_y", None), pallet.max_overhang_y, "overhang_y")
+    # vars() keeps partially populated namespaces working without a getattr per flag.
+    options = vars(args)
+    width = options.get("pallet_width")
+    depth = options.get("pallet_depth")
+    height = options.get("pallet_height")
+    overhang_x = options.get("overhang_x")
+    overhang_y = options.get("overhang_y")
+    if width is depth is height is overhang_x is overhang_y is None:
+        return pallet
+    dims = pallet.dimensions
     return Pallet(
         id=pallet.id,
-        dimensions=Dimensions(width=width, depth=depth, height=height),
-        max_overhang_x=overhang_x,
-        max_overhang_y=overhang_y,
+        dimensions=Dimensions(
+            width=_positive_value(width, dims.width, "pallet_width"),
+            depth=_positive_value(depth, dims.depth, "pallet_depth"),
+            height=_positive_value(height, dims.height, "pallet_height"),
+        ),
+        max_overhang_x=_non_negative_value(overhang_x, pallet.max_overhang_x, "overhang_x"),
+        max_overhang_y=_non_negative_value(overhang_y, pallet.max_overhang_y, "overhang_y"),
     )
 
 
 def _resolve_box(repo: DataRepository, args: argparse.Namespace) -> Box:
     box = repo.get_box(args.box)
-    width = _positive_value(getattr(args, "box_width", None), box.dimensions.width, "box_width")
-    depth = _positive_value(getattr(args, "box_depth", None), box.dimensions.depth, "box_depth")
-    height = _positive_value(getattr(args, "box_height", None), box.dimensions.height, "box_height")
-    weight = _positive_value(getattr(args, "box_weight", None), box.weight, "box_weight")
-    label = getattr(args, "label_position", None) or box.label_position
+    options = vars(args)
+    width = options.get("box_width")
+    depth = options.get("box_depth")
+    height = options.get("box_height")
+    weight = options.get("box_weight")
+    label = options.get("label_position")
+    if width is depth is height is weight is None and not label:
+        return box
+    dims = box.dimensions
     return Box(
         id=box.id,
-        dimensions=Dimensions(width=width, depth=depth, height=height),
-        weight=weight,
-        label_position=label,
+        dimensions=Dimensions(
+            width=_positive_value(width, dims.width, "box_width"),
+            depth=_positive_value(depth, dims.depth, "box_depth"),
+            height=_positive_value(height, dims.height, "box_height"),
+        ),
+        weight=_positive_value(weight, box.weight, "box_weight"),
+        label_position=label or box.label_position,
     )
 
 
 def _resolve_interleaf(repo: DataRepository, args: argparse.Namespace) -> Interleaf | None:
-    interleaf_id = getattr(args, "interleaf", None)
+    interleaf_id = vars(args).get("interleaf")
     if not interleaf_id:
         return None
     return repo.get_interleaf(interleaf_id)
@@ -585,159 +535,158 @@ def _non_negative_value(value: float | None, fallback: float, name: str) -> floa
 
 
 def _reference_frame_from_args(origin: str, axes: str) -> ReferenceFrame:
-    axes_token = (axes or "EN").strip().upper()
-    if len(axes_token) != 2:
-        raise ValueError("Formato assi non valido. Usa due lettere (E/W + N/S)")
-    return ReferenceFrame(origin=origin.strip(), x_axis=axes_token[0], y_axis=axes_token[1])
+    try:
+        x_axis, y_axis = (axes or "EN").strip().upper()
+    except ValueError:
+        raise ValueError("Formato assi non valido. Usa due lettere (E/W + N/S)") from None
+    return ReferenceFrame(origin=origin.strip(), x_axis=x_axis, y_axis=y_axis)
+
+
+def _axes_type(value: str) -> str:
+    token = value.strip().upper()
+    if len(token) != 2 or token[0] not in "EW" or token[1] not in "NS":
+        raise argparse.ArgumentTypeError("Formato assi non valido. Usa due lettere (E/W + N/S)")
+    return token
+
+
+def _palette_type(value: str) -> str:
+    from .render3d import list_color_palettes
+
+    palettes = list_color_palettes()
+    if value not in palettes:
+        raise argparse.ArgumentTypeError(
+            "palette '{}' non valida (scegli tra {})".format(value, ", ".join(palettes))
+        )
+    return value
 
 
 def _calculate_layer(request: LayerRequest) -> LayerPlan:
-    planner = RecursiveFiveBlockPlanner()
-    plan = planner.plan_layer(request)
-    collisions = CollisionChecker().validate(plan, request)
+    key = tuple(getattr(request, name) for name in _REQUEST_FIELDS)
+    try:
+        hash(key)
+    except TypeError:  # e.g. a Tool built with a list of orientations
+        return _plan_layer(request)
+    return _cached_layer(key).copy()
+
+
+_REQUEST_FIELDS = tuple(LayerRequest.__dataclass_fields__)
+
+
+@lru_cache(maxsize=64)
+def _cached_layer(key: tuple) -> LayerPlan:
+    """Plan a layer once per distinct request; callers receive copies."""
+
+    return _plan_layer(LayerRequest(*key))
+
+
+def _plan_layer(request: LayerRequest) -> LayerPlan:
+    plan = _sequence_planner().layer_planner.plan_layer(request)
+    collisions = _collision_checker().validate(plan, request)
     plan.collisions = [c.description for c in collisions]
     return plan
 
 
+@lru_cache(maxsize=1)
+def _collision_checker() -> CollisionChecker:
+    """Shared stateless checker, created on first use to keep imports lazy."""
+
+    from .collisions import CollisionChecker
+
+    return CollisionChecker()
+
+
+@lru_cache(maxsize=1)
+def _sequence_planner() -> LayerSequencePlanner:
+    """Shared stateless sequence planner, created on first use."""
+
+    from .sequence import LayerSequencePlanner
+
+    return LayerSequencePlanner()
+
+
+def _apply_layer_approaches(
+    layers: list[LayerPlan],
+    direction: str | None,
+    distance: float,
+    overrides: dict[str, ApproachConfig],
+) -> None:
+    """Apply ``direction`` to every layer, or each layer's own start corner."""
+
+    fixed = direction.upper() if direction else None
+    for layer in layers:
+        corner = layer.start_corner
+        apply_approach(layer, fixed or _UPPER.get(corner) or corner.upper(), distance, overrides)
+
+
+_CORNERS = ("NE", "NW", "SE", "SW")
+# Start corners are almost always one of the four tags; look them up instead
+# of upper-casing a fresh copy for every layer.
+_UPPER = {**{corner.lower(): corner for corner in _CORNERS}, **{corner: corner for corner in _CORNERS}}
+
+
 def _build_notes(values: list[str]) -> dict[str, str]:
     notes: dict[str, str] = {}
     for raw in values:
-        if "=" not in raw:
+        key, sep, value = raw.partition("=")
+        if sep:
+            notes[key.strip()] = value.strip()
+        else:
             notes[f"note_{len(notes)+1}"] = raw
-            continue
-        key, value = raw.split("=", 1)
-        notes[key.strip()] = value.strip()
     return notes
 
 
 def _print_table(headers: tuple[str, ...], rows: list[tuple[str, ...]]) -> None:
-    widths = [len(header) for header in headers]
-    for row in rows:
-        for idx, cell in enumerate(row):
-            widths[idx] = max(widths[idx], len(cell))
-    format_str = "  ".join(f"{{:<{width}}}" for width in widths)
-    print(format_str.format(*headers))
-    print("  ".join("-" * width for width in widths))
-    for row in rows:
-        print(format_str.format(*row))
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+    format_row = "  ".join(f"{{:<{width}}}" for width in widths).format
+    lines = [format_row(*headers), "  ".join("-" * width for width in widths)]
+    lines.extend(format_row(*row) for row in rows)
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
 
 
 def run_catalog(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
-    records: list[dict]
-    rows: list[tuple[str, ...]]
+    repo = _get_repo(args.db, args.seed)
     show_stats = bool(getattr(args, "stats", False))
+    entities: list
     if args.entity == "pallets":
-        pallets = repo.list_pallets()
-        records = [
-            {
-                "id": pallet.id,
-                "width_mm": pallet.dimensions.width,
-                "depth_mm": pallet.dimensions.depth,
-                "height_mm": pallet.dimensions.height,
-                "max_overhang_x_mm": pallet.max_overhang_x,
-                "max_overhang_y_mm": pallet.max_overhang_y,
-            }
-            for pallet in pallets
-        ]
-        records = _apply_catalog_filter(records, args.filter, ("id",))
-        rows = [
-            (
-                record["id"],
-                f"{record['width_mm']:.0f}x{record['depth_mm']:.0f}x{record['height_mm']:.0f}",
-                f"±X {record['max_overhang_x_mm']:.0f} | ±Y {record['max_overhang_y_mm']:.0f}",
-            )
-            for record in records
-        ]
+        entities = repo.list_pallets()
+        fields: tuple[str, ...] = ("id",)
         headers = ("ID", "Dimensioni (mm)", "Sbordo max (mm)")
+        to_record, to_row = _pallet_record, _pallet_row
     elif args.entity == "boxes":
-        boxes = repo.list_boxes()
-        records = [
-            {
-                "id": box.id,
-                "width_mm": box.dimensions.width,
-                "depth_mm": box.dimensions.depth,
-                "height_mm": box.dimensions.height,
-                "weight_kg": box.weight,
-                "label_position": box.label_position,
-            }
-            for box in boxes
-        ]
-        records = _apply_catalog_filter(records, args.filter, ("id", "label_position"))
-        rows = [
-            (
-                record["id"],
-                f"{record['width_mm']:.0f}x{record['depth_mm']:.0f}x{record['height_mm']:.0f}",
-                f"{record['weight_kg']:.2f}kg",
-                record["label_position"] or "-",
-            )
-            for record in records
-        ]
+        entities = repo.list_boxes()
+        fields = ("id", "label_position")
         headers = ("ID", "Dimensioni (mm)", "Peso", "Etichetta")
+        to_record, to_row = _box_record, _box_row
     elif args.entity == "tools":
-        tools = repo.list_tools()
-        records = [
-            {
-                "id": tool.id,
-                "name": tool.name,
-                "max_boxes": tool.max_boxes,
-                "allowed_orientations": list(tool.allowed_orientations),
-                "pickup_offset_mm": {
-                    "x": tool.pickup_offset.x,
-                    "y": tool.pickup_offset.y,
-                    "z": tool.pickup_offset.z,
-                },
-            }
-            for tool in tools
-        ]
-        records = _apply_catalog_filter(records, args.filter, ("id", "name", "allowed_orientations"))
-        rows = [
-            (
-                record["id"],
-                record["name"],
-                str(record["max_boxes"]),
-                ",".join(str(value) for value in record["allowed_orientations"]) or "-",
-                "({x:.0f},{y:.0f},{z:.0f})".format(**record["pickup_offset_mm"]),
-            )
-            for record in records
-        ]
+        entities = repo.list_tools()
+        fields = ("id", "name", "allowed_orientations")
         headers = ("ID", "Nome", "# Scatole", "Orientazioni", "Offset (mm)")
+        to_record, to_row = _tool_record, _tool_row
     else:
-        interleaves = repo.list_interleaves()
-        records = [
-            {
-                "id": interleaf.id,
-                "thickness_mm": interleaf.thickness,
-                "weight_kg": interleaf.weight,
-                "material": interleaf.material,
-            }
-            for interleaf in interleaves
-        ]
-        records = _apply_catalog_filter(records, args.filter, ("id", "material"))
-        rows = [
-            (
-                record["id"],
-                f"{record['thickness_mm']:.1f}mm",
-                f"{record['weight_kg']:.2f}kg",
-                record["material"],
-            )
-            for record in records
-        ]
+        entities = repo.list_interleaves()
+        fields = ("id", "material")
         headers = ("ID", "Spessore", "Peso", "Materiale")
+        to_record, to_row = _interleaf_record, _interleaf_row
+    entities = _apply_catalog_filter(entities, args.filter, fields)
+
+    # Records feed the JSON payload and the stats; the table only needs rows.
+    records: list[NamedTuple] = []
+    if args.format == "json" or show_stats:
+        records = [to_record(entity) for entity in entities]
 
     summary = _catalog_summary(args.entity, records) if show_stats else None
 
     if args.format == "json":
         payload: dict | list
         if summary is None:
-            payload = records
+            payload = [record._asdict() for record in records]
         else:
-            payload = {"records": records, "stats": summary}
-        print(json.dumps(payload, indent=2, ensure_ascii=False))
+            payload = {"records": [record._asdict() for record in records], "stats": summary}
+        _write_json(payload)
     else:
-        if rows:
-            _print_table(headers, rows)
+        if entities:
+            _print_table(headers, [to_row(entity) for entity in entities])
         else:
             print("Nessun dato disponibile")
         if summary:
@@ -748,18 +697,15 @@ def run_catalog(args: argparse.Namespace) -> None:
                 else:
                     label = key.replace("_", " ").capitalize()
                 print(f"  - {label}: {_format_stat_value(value)}")
-    repo.close()
 
 
 def run_quote(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
         frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     report = build_quote_report(pallet, box, frame)
     if args.format == "json":
@@ -770,25 +716,21 @@ def run_quote(args: argparse.Namespace) -> None:
         _print_table(headers, rows)
         print("Angolo quote: 0.0° (fisso e non modificabile)")
         print(f"Sistema di riferimento: origine {report.origin} - assi {report.axes}")
-    repo.close()
 
 
 def run_grip(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
         frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         tool_width = _positive_optional(getattr(args, "tool_width", None), "tool_width")
         tool_depth = _positive_optional(getattr(args, "tool_depth", None), "tool_depth")
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     definition = MultiGripDefinition(
@@ -804,12 +746,12 @@ def run_grip(args: argparse.Namespace) -> None:
     try:
         layout = build_layout(definition)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
-    warnings = evaluate_envelope(layout, pallet, pallet.max_overhang_x, pallet.max_overhang_y)
+    warnings = evaluate_gripper_constraints(
+        layout, pallet, pallet.max_overhang_x, pallet.max_overhang_y, tool_width, tool_depth
+    )
     warnings.extend(detect_finger_collisions(layout))
-    warnings.extend(evaluate_tool_clearance(layout, tool_width, tool_depth))
     total_boxes = definition.total_boxes()
     if total_boxes > tool.max_boxes:
         warnings.append(
@@ -863,30 +805,28 @@ def run_grip(args: argparse.Namespace) -> None:
         ]
         _print_table(headers, rows)
         print(f"Sistema di riferimento: origine {frame.origin} - assi {frame.axes_token}")
-    repo.close()
 
 
 def run_viewer(args: argparse.Namespace) -> None:
+    from .annotations import PlacementAnnotator
+    from .snap import SnapPointGenerator
+
     if args.explode_gap < 0:
         raise SystemExit("--explode-gap deve essere maggiore o uguale a zero")
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     request = LayerRequest(
@@ -900,7 +840,6 @@ def run_viewer(args: argparse.Namespace) -> None:
     try:
         overrides = parse_approach_overrides(args.approach_override)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     annotator = PlacementAnnotator(
@@ -909,8 +848,8 @@ def run_viewer(args: argparse.Namespace) -> None:
     )
 
     if args.layers > 1:
-        planner = LayerSequencePlanner()
-        collision_checker = CollisionChecker()
+        planner = _sequence_planner()
+        collision_checker = _collision_checker()
         plan = planner.stack_layers(
             request,
             levels=args.layers,
@@ -921,9 +860,9 @@ def run_viewer(args: argparse.Namespace) -> None:
             interleaf=interleaf,
             interleaf_frequency=args.interleaf_frequency,
         )
-        for layer in plan.layers:
-            direction = (args.approach_direction or layer.start_corner).upper()
-            apply_approach(layer, direction, args.approach_distance, overrides)
+        _apply_layer_approaches(
+            plan.layers, args.approach_direction, args.approach_distance, overrides
+        )
         active_plan: LayerPlan | LayerSequencePlan = plan
     else:
         plan = _calculate_layer(request)
@@ -1024,9 +963,8 @@ def run_viewer(args: argparse.Namespace) -> None:
     else:
         base_layer = active_plan
     if base_layer:
-        annotations = annotator.annotate(base_layer)
-        if annotations:
-            preview = annotations[0]
+        preview = next(annotator.iter_annotations(base_layer), None)
+        if preview:
             label = preview.label_position
             vector = preview.approach_vector
             print(
@@ -1062,7 +1000,6 @@ def run_viewer(args: argparse.Namespace) -> None:
             frame.origin, frame.axes_token
         )
     )
-    repo.close()
 
 
 def _footprint_for_layer(layer: LayerPlan, width: float, depth: float) -> tuple[float, float]:
@@ -1071,53 +1008,185 @@ def _footprint_for_layer(layer: LayerPlan, width: float, depth: float) -> tuple[
     return depth, width
 
 
+class _PalletRecord(NamedTuple):
+    id: str
+    width_mm: float
+    depth_mm: float
+    height_mm: float
+    max_overhang_x_mm: float
+    max_overhang_y_mm: float
+
+
+class _BoxRecord(NamedTuple):
+    id: str
+    width_mm: float
+    depth_mm: float
+    height_mm: float
+    weight_kg: float
+    label_position: str | None
+
 
-def _catalog_summary(entity: str, records: list[dict]) -> dict[str, float | int]:
+class _ToolRecord(NamedTuple):
+    id: str
+    name: str
+    max_boxes: int
+    allowed_orientations: list[int]
+    pickup_offset_mm: dict[str, float]
+
+
+class _InterleafRecord(NamedTuple):
+    id: str
+    thickness_mm: float
+    weight_kg: float
+    material: str
+
+
+def _pallet_record(pallet: Pallet) -> _PalletRecord:
+    dims = pallet.dimensions
+    return _PalletRecord(
+        pallet.id,
+        dims.width,
+        dims.depth,
+        dims.height,
+        pallet.max_overhang_x,
+        pallet.max_overhang_y,
+    )
+
+
+def _pallet_row(pallet: Pallet) -> tuple[str, ...]:
+    dims = pallet.dimensions
+    return (
+        pallet.id,
+        f"{dims.width:.0f}x{dims.depth:.0f}x{dims.height:.0f}",
+        f"±X {pallet.max_overhang_x:.0f} | ±Y {pallet.max_overhang_y:.0f}",
+    )
+
+
+def _box_record(box: Box) -> _BoxRecord:
+    dims = box.dimensions
+    return _BoxRecord(box.id, dims.width, dims.depth, dims.height, box.weight, box.label_position)
+
+
+def _box_row(box: Box) -> tuple[str, ...]:
+    dims = box.dimensions
+    return (
+        box.id,
+        f"{dims.width:.0f}x{dims.depth:.0f}x{dims.height:.0f}",
+        f"{box.weight:.2f}kg",
+        box.label_position or "-",
+    )
+
+
+def _tool_record(tool: Tool) -> _ToolRecord:
+    offset = tool.pickup_offset
+    return _ToolRecord(
+        tool.id,
+        tool.name,
+        tool.max_boxes,
+        list(tool.allowed_orientations),
+        {"x": offset.x, "y": offset.y, "z": offset.z},
+    )
+
+
+def _tool_row(tool: Tool) -> tuple[str, ...]:
+    offset = tool.pickup_offset
+    return (
+        tool.id,
+        tool.name,
+        str(tool.max_boxes),
+        ",".join(map(str, tool.allowed_orientations)) or "-",
+        f"({offset.x:.0f},{offset.y:.0f},{offset.z:.0f})",
+    )
+
+
+def _interleaf_record(interleaf: Interleaf) -> _InterleafRecord:
+    return _InterleafRecord(interleaf.id, interleaf.thickness, interleaf.weight, interleaf.material)
+
+
+def _interleaf_row(interleaf: Interleaf) -> tuple[str, ...]:
+    return (
+        interleaf.id,
+        f"{interleaf.thickness:.1f}mm",
+        f"{interleaf.weight:.2f}kg",
+        interleaf.material,
+    )
+
+
+def _catalog_summary(entity: str, records: list[NamedTuple]) -> dict[str, float | int]:
     summary: dict[str, float | int] = {"count": len(records)}
     if not records:
         return summary
     if entity == "pallets":
         summary.update(
-            {
-                "avg_width_mm": _mean(record["width_mm"] for record in records),
-                "avg_depth_mm": _mean(record["depth_mm"] for record in records),
-                "avg_overhang_x_mm": _mean(record["max_overhang_x_mm"] for record in records),
-            }
+            _column_means(
+                records,
+                {
+                    "avg_width_mm": "width_mm",
+                    "avg_depth_mm": "depth_mm",
+                    "avg_overhang_x_mm": "max_overhang_x_mm",
+                },
+            )
         )
     elif entity == "boxes":
         summary.update(
-            {
-                "avg_weight_kg": _mean(record["weight_kg"] for record in records),
-                "avg_height_mm": _mean(record["height_mm"] for record in records),
-            }
+            _column_means(records, {"avg_weight_kg": "weight_kg", "avg_height_mm": "height_mm"})
         )
     elif entity == "tools":
-        unique_orientations = {
-            str(orientation)
-            for record in records
-            for orientation in record.get("allowed_orientations", [])
-        }
+        capacity = 0
+        unique_orientations: set[str] = set()
+        for record in records:
+            capacity += record.max_boxes
+            unique_orientations.update(map(str, record.allowed_orientations))
         summary.update(
             {
-                "avg_capacity": _mean(record["max_boxes"] for record in records),
+                "avg_capacity": capacity / len(records),
                 "unique_orientations": len(unique_orientations),
             }
         )
     else:
         summary.update(
-            {
-                "avg_thickness_mm": _mean(record["thickness_mm"] for record in records),
-                "avg_weight_kg": _mean(record["weight_kg"] for record in records),
-            }
+            _column_means(
+                records, {"avg_thickness_mm": "thickness_mm", "avg_weight_kg": "weight_kg"}
+            )
         )
     return summary
 
 
-def _mean(values: Iterable[float]) -> float:
-    data = list(values)
-    if not data:
-        return 0.0
-    return sum(data) / len(data)
+def _column_means(records: list[NamedTuple], columns: dict[str, str]) -> dict[str, float]:
+    """Average several record fields in a single pass over ``records``."""
+
+    fields = tuple(columns.values())
+    totals = [0.0] * len(fields)
+    for record in records:
+        for idx, field in enumerate(fields):
+            totals[idx] += getattr(record, field)
+    count = len(records)
+    return {label: total / count for label, total in zip(columns, totals)}
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Emit buffered report lines with a single write."""
+
+    if lines:
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+
+
+def _write_json(payload: dict | list) -> None:
+    """Print ``payload`` indented on a terminal, compact UTF-8 bytes otherwise."""
+
+    stream = sys.stdout
+    if stream.isatty():
+        print(json.dumps(payload, indent=2, ensure_ascii=False))
+        return
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        stream.write(text + "\n")
+        return
+    stream.flush()
+    buffer.write(text.encode("utf-8") + b"\n")
+    buffer.flush()
 
 
 def _format_stat_value(value: float | int) -> str:
@@ -1127,57 +1196,54 @@ def _format_stat_value(value: float | int) -> str:
 
 
 def _apply_catalog_filter(
-    records: list[dict],
+    records: list,
     needle: str | None,
     fields: tuple[str, ...],
-) -> list[dict]:
+) -> list:
     if not needle:
         return records
     lowered = needle.strip().lower()
     if not lowered:
         return records
-    filtered: list[dict] = []
-    for record in records:
-        if _record_matches(record, lowered, fields):
-            filtered.append(record)
-    return filtered
+    return [record for record in records if _record_matches(record, lowered, fields)]
 
 
-def _record_matches(record: dict, needle: str, fields: tuple[str, ...]) -> bool:
+def _record_matches(record: object, needle: str, fields: tuple[str, ...]) -> bool:
+    return any(needle in text for text in _iter_field_text(record, fields))
+
+
+def _iter_field_text(record: object, fields: tuple[str, ...]) -> Iterator[str]:
+    """Yield the lowercase text of each searchable value, one at a time."""
+
     for field in fields:
-        value = record.get(field)
+        value = getattr(record, field, None)
         if value is None:
             continue
-        values: list[str]
         if isinstance(value, (list, tuple, set)):
-            values = [str(entry).lower() for entry in value]
+            for entry in value:
+                yield str(entry).lower()
         else:
-            values = [str(value).lower()]
-        for text in values:
-            if needle in text:
-                return True
-    return False
+            yield str(value).lower()
 
 
 def run_plc(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .annotations import PlacementAnnotator
+    from .plc import SiemensPLCExporter
+
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:  # pragma: no cover - defensive user input
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     request = LayerRequest(
@@ -1191,7 +1257,6 @@ def run_plc(args: argparse.Namespace) -> None:
     try:
         overrides = parse_approach_overrides(args.approach_override)
     except ValueError as exc:  # pragma: no cover - defensive user input
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     annotator = PlacementAnnotator(
@@ -1201,8 +1266,8 @@ def run_plc(args: argparse.Namespace) -> None:
 
     plan: LayerPlan | LayerSequencePlan
     if args.layers > 1:
-        sequence_planner = LayerSequencePlanner()
-        collision_checker = CollisionChecker()
+        sequence_planner = _sequence_planner()
+        collision_checker = _collision_checker()
         plan = sequence_planner.stack_layers(
             request,
             levels=args.layers,
@@ -1213,9 +1278,9 @@ def run_plc(args: argparse.Namespace) -> None:
             interleaf=interleaf,
             interleaf_frequency=args.interleaf_frequency,
         )
-        for layer in plan.layers:
-            layer_direction = (args.approach_direction or layer.start_corner).upper()
-            apply_approach(layer, layer_direction, args.approach_distance, overrides)
+        _apply_layer_approaches(
+            plan.layers, args.approach_direction, args.approach_distance, overrides
+        )
     else:
         plan = _calculate_layer(request)
         direction = (args.approach_direction or args.corner).upper()
@@ -1226,17 +1291,20 @@ def run_plc(args: argparse.Namespace) -> None:
     print(f"File PLC salvato in {path}")
     if isinstance(plan, LayerSequencePlan) and plan.interleaves:
         print(f"Include {len(plan.interleaves)} interfalde nel profilo Z")
-    repo.close()
 
 
 def run_plan(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .annotations import PlacementAnnotator
+    from .exporter import PlanExporter
+    from .snap import SnapPointGenerator
+
+    lines: list[str] = []
+    out = lines.append
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
@@ -1261,18 +1329,18 @@ def run_plan(args: argparse.Namespace) -> None:
     approach_direction = (args.approach_direction or args.corner).upper()
     apply_approach(plan, approach_direction, args.approach_distance, overrides)
 
-    print(f"Computed orientation: {plan.orientation}°")
-    print(f"Fill ratio: {plan.fill_ratio:.2%}")
-    print("Blocks:")
+    out(f"Computed orientation: {plan.orientation}°")
+    out(f"Fill ratio: {plan.fill_ratio:.2%}")
+    out("Blocks:")
     for block in plan.describe_blocks():
-        print(f"  - {block}")
-    print(f"Placements: {len(plan.placements)}")
+        out(f"  - {block}")
+    out(f"Placements: {len(plan.placements)}")
     if collisions:
-        print("Collisions detected:")
+        out("Collisions detected:")
         for collision in collisions:
-            print(f"  - {collision}")
+            out(f"  - {collision}")
     else:
-        print("No collisions detected")
+        out("No collisions detected")
 
     generator = SnapPointGenerator()
     width, depth = (
@@ -1280,19 +1348,19 @@ def run_plan(args: argparse.Namespace) -> None:
         box.dimensions.depth if plan.orientation == 0 else box.dimensions.width,
     )
     snap_points = generator.generate(plan, width, depth)
-    print(f"Generated snap points for {len(snap_points)} placements")
+    out(f"Generated snap points for {len(snap_points)} placements")
 
     annotator = PlacementAnnotator(
         default_approach=args.approach_distance,
         label_offset=args.label_offset,
     )
-    annotations = annotator.annotate(plan)
-    if annotations:
-        print("Preview label & approach data:")
-        for annotation in annotations[: min(3, len(annotations))]:
+    preview = list(islice(annotator.iter_annotations(plan), 3))
+    if preview:
+        out("Preview label & approach data:")
+        for annotation in preview:
             label = annotation.label_position
             vector = annotation.approach_vector
-            print(
+            out(
                 "  - placement #{idx}: label=({lx:.1f},{ly:.1f},{lz:.1f}) | approach {dir} {dist:.1f}mm vector=({vx:.1f},{vy:.1f},{vz:.1f})"
                 .format(
                     idx=annotation.placement_index,
@@ -1307,30 +1375,31 @@ def run_plan(args: argparse.Namespace) -> None:
                 )
             )
     else:
-        print("No annotations available (missing box metadata)")
+        out("No annotations available (missing box metadata)")
 
     if args.export:
         exporter = PlanExporter(annotator=annotator)
         path = exporter.to_file(plan, args.export)
-        print(f"Plan exported to {path}")
-
-    repo.close()
+        out(f"Plan exported to {path}")
+    _write_lines(lines)
 
 
 def run_stack(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .annotations import PlacementAnnotator
+    from .exporter import PlanExporter
+
+    lines: list[str] = []
+    out = lines.append
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
@@ -1349,8 +1418,8 @@ def run_stack(args: argparse.Namespace) -> None:
     except ValueError as exc:  # pragma: no cover - defensive user input
         raise SystemExit(str(exc)) from exc
 
-    sequence_planner = LayerSequencePlanner()
-    collision_checker = CollisionChecker()
+    sequence_planner = _sequence_planner()
+    collision_checker = _collision_checker()
     sequence = sequence_planner.stack_layers(
         request,
         levels=args.layers,
@@ -1371,22 +1440,27 @@ def run_stack(args: argparse.Namespace) -> None:
     if args.approach_direction:
         sequence.metadata["approach_direction"] = args.approach_direction.upper()
 
-    print(
+    out(
         f"Computed {sequence.levels()} layers totaling {sequence.total_boxes()} boxes (max height {sequence.max_height():.2f}mm)"
     )
+    fixed_direction = args.approach_direction.upper() if args.approach_direction else None
+    approach_distance = args.approach_distance
     for idx, layer in enumerate(sequence.layers, start=1):
-        print(
+        out(
             f"Layer {idx}: corner={layer.start_corner} orientation={layer.orientation} fill={layer.fill_ratio:.2%}"
         )
-        layer_direction = (args.approach_direction or layer.start_corner).upper()
-        apply_approach(layer, layer_direction, args.approach_distance, overrides)
+        apply_approach(
+            layer,
+            fixed_direction or _UPPER.get(layer.start_corner) or layer.start_corner.upper(),
+            approach_distance,
+            overrides,
+        )
 
-        annotations = annotator.annotate(layer)
-        if annotations:
-            first = annotations[0]
+        first = next(annotator.iter_annotations(layer), None)
+        if first:
             label = first.label_position
             vector = first.approach_vector
-            print(
+            out(
                 "    label preview: ({lx:.1f},{ly:.1f},{lz:.1f}) approach {dir} {dist:.1f}mm vector=({vx:.1f},{vy:.1f},{vz:.1f})"
                 .format(
                     lx=label.x,
@@ -1401,46 +1475,43 @@ def run_stack(args: argparse.Namespace) -> None:
             )
         if layer.collisions:
             for collision in layer.collisions:
-                print(f"  - collision: {collision}")
+                out(f"  - collision: {collision}")
         else:
-            print("  - no collisions")
+            out("  - no collisions")
 
     if args.export:
         exporter = PlanExporter(annotator=annotator)
         path = exporter.to_file(sequence, args.export)
-        print(f"Sequence exported to {path}")
+        out(f"Sequence exported to {path}")
 
     if sequence.interleaves:
-        print(
-            "Interfalde inserite:",
-            ", ".join(
+        out(
+            "Interfalde inserite: "
+            + ", ".join(
                 f"dopo layer {entry.level} (+{entry.interleaf.thickness:.1f}mm)"
                 for entry in sequence.interleaves
-            ),
+            )
         )
-
-    repo.close()
+    _write_lines(lines)
 
 
 def run_render(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .render3d import export_sequence_to_obj
+
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:  # pragma: no cover - defensive user input
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     request = LayerRequest(
@@ -1450,8 +1521,8 @@ def run_render(args: argparse.Namespace) -> None:
         start_corner=args.corner,
         reference_frame=reference_frame,
     )
-    sequence_planner = LayerSequencePlanner()
-    collision_checker = CollisionChecker()
+    sequence_planner = _sequence_planner()
+    collision_checker = _collision_checker()
     sequence = sequence_planner.stack_layers(
         request,
         levels=args.layers,
@@ -1479,10 +1550,8 @@ def run_render(args: argparse.Namespace) -> None:
             material_path=material_path,
         )
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
-    repo.close()
     print(
         "Modello 3D generato: {path} (box={boxes}, facce totali={faces}, vertici={verts})".format(
             path=result.path,
@@ -1496,19 +1565,22 @@ def run_render(args: argparse.Namespace) -> None:
 
 
 def run_archive(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .annotations import PlacementAnnotator
+    from .exporter import PlanExporter
+    from .project import ProjectArchiver
+
+    lines: list[str] = []
+    out = lines.append
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
@@ -1535,8 +1607,8 @@ def run_archive(args: argparse.Namespace) -> None:
     archiver = ProjectArchiver(exporter=exporter)
 
     if args.layers > 1:
-        sequence_planner = LayerSequencePlanner()
-        collision_checker = CollisionChecker()
+        sequence_planner = _sequence_planner()
+        collision_checker = _collision_checker()
         plan = sequence_planner.stack_layers(
             request,
             levels=args.layers,
@@ -1551,9 +1623,9 @@ def run_archive(args: argparse.Namespace) -> None:
         plan.metadata["label_offset"] = f"{args.label_offset:.2f}"
         if args.approach_direction:
             plan.metadata["approach_direction"] = args.approach_direction.upper()
-        for layer in plan.layers:
-            layer_direction = (args.approach_direction or layer.start_corner).upper()
-            apply_approach(layer, layer_direction, args.approach_distance, overrides)
+        _apply_layer_approaches(
+            plan.layers, args.approach_direction, args.approach_distance, overrides
+        )
     else:
         plan = _calculate_layer(request)
         direction = (args.approach_direction or args.corner).upper()
@@ -1569,11 +1641,11 @@ def run_archive(args: argparse.Namespace) -> None:
         metadata=notes,
     )
     path = archiver.save(project, args.archive)
-    print(f"Archivio creato: {path}")
-    print(
+    out(f"Archivio creato: {path}")
+    out(
         f"  - layers: {project.summary.get('layers')} total_boxes: {project.summary.get('total_boxes')} max_height: {project.summary.get('max_height_mm')}mm"
     )
-    repo.close()
+    _write_lines(lines)
 
 
 def run_gui(args: argparse.Namespace) -> None:
@@ -1582,8 +1654,7 @@ def run_gui(args: argparse.Namespace) -> None:
     except RuntimeError as exc:  # pragma: no cover - optional dependency
         raise SystemExit(str(exc)) from exc
 
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    repo = _get_repo(args.db, args.seed)
     pallets = repo.list_pallets()
     boxes = repo.list_boxes()
     tools = repo.list_tools()
@@ -1591,14 +1662,12 @@ def run_gui(args: argparse.Namespace) -> None:
 
     def _default_selection(items, requested, label):
         if not items:
-            repo.close()
             raise SystemExit(f"Nessun {label} disponibile nel database.")
         if requested is None:
             return items[0].id
         for item in items:
             if item.id == requested:
                 return requested
-        repo.close()
         raise SystemExit(f"{label} '{requested}' non trovato nel database.")
 
     default_pallet_id = _default_selection(pallets, args.pallet, "pallet")
@@ -1607,12 +1676,10 @@ def run_gui(args: argparse.Namespace) -> None:
 
     if args.interleaf:
         if not any(interleaf.id == args.interleaf for interleaf in interleaves):
-            repo.close()
             raise SystemExit(f"Interfalda '{args.interleaf}' non trovata nel database.")
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:  # pragma: no cover - defensive user input
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         app = PalletGuiApp(
@@ -1636,32 +1703,30 @@ def run_gui(args: argparse.Namespace) -> None:
             default_approach_overrides=args.approach_override,
         )
     except RuntimeError as exc:  # pragma: no cover - optional dependency
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
-    repo.close()
     app.run()
 
 
 def run_analyze(args: argparse.Namespace) -> None:
-    repo = DataRepository(args.db)
-    repo.initialize(args.seed)
+    from .metrics import compute_layer_metrics, compute_sequence_metrics
+
+    lines: list[str] = []
+    out = lines.append
+    repo = _get_repo(args.db, args.seed)
     try:
         pallet = _resolve_pallet(repo, args)
         box = _resolve_box(repo, args)
     except ValueError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     tool = repo.get_tool(args.tool)
     try:
         interleaf = _resolve_interleaf(repo, args)
     except KeyError as exc:
-        repo.close()
         raise SystemExit(str(exc)) from exc
     try:
         reference_frame = _reference_frame_from_args(args.origin, args.axes)
     except ValueError as exc:  # pragma: no cover - defensive user input
-        repo.close()
         raise SystemExit(str(exc)) from exc
 
     request = LayerRequest(
@@ -1673,18 +1738,18 @@ def run_analyze(args: argparse.Namespace) -> None:
     )
 
     if args.layers > 1:
-        sequence_planner = LayerSequencePlanner()
+        sequence_planner = _sequence_planner()
         sequence = sequence_planner.stack_layers(
             request,
             levels=args.layers,
             corners=args.corners,
             z_step=args.z_step,
-            collision_checker=CollisionChecker(),
+            collision_checker=_collision_checker(),
             interleaf=interleaf,
             interleaf_frequency=args.interleaf_frequency,
         )
         metrics = compute_sequence_metrics(sequence)
-        print(
+        out(
             "Analisi sequenza: {layers} strati, {boxes} scatole, peso totale {weight:.2f}kg".format(
                 layers=metrics.layers,
                 boxes=metrics.total_boxes,
@@ -1694,7 +1759,7 @@ def run_analyze(args: argparse.Namespace) -> None:
     else:
         plan = _calculate_layer(request)
         metrics = compute_layer_metrics(plan)
-        print(
+        out(
             "Analisi strato singolo: {boxes} scatole, peso totale {weight:.2f}kg, fill {fill:.2%}".format(
                 boxes=metrics.total_boxes,
                 weight=metrics.total_weight,
@@ -1702,21 +1767,21 @@ def run_analyze(args: argparse.Namespace) -> None:
             )
         )
 
-    print(
+    out(
         "Centro di massa: ({:.1f}, {:.1f}, {:.1f}) mm".format(
             metrics.center_of_mass.x,
             metrics.center_of_mass.y,
             metrics.center_of_mass.z,
         )
     )
-    print(
+    out(
         "Ingombro: {:.1f} x {:.1f} mm".format(
             metrics.footprint_width,
             metrics.footprint_depth,
         )
     )
-    print(f"Altezza massima: {metrics.max_height:.1f} mm")
-    repo.close()
+    out(f"Altezza massima: {metrics.max_height:.1f} mm")
+    _write_lines(lines)
 
 
 def main() -> None:
@@ -4,7 +4,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, List, Sequence
 
-from .models import LayerPlan, LayerPlacement, LayerRequest, Vector3
+from ._broadphase import grid_pairs
+from .models import LayerPlan, LayerRequest
 
 
 @dataclass
@@ -17,9 +18,18 @@ class CollisionChecker:
         self.clearance = clearance
 
     def validate(self, plan: LayerPlan, request: LayerRequest) -> Sequence[Collision]:
+        # Coordinates stay in double precision on purpose: the arithmetic runs
+        # on Python floats either way, and touching boxes sit exactly
+        # ``clearance`` apart, which float32 rounding could turn into overlaps.
+        xs, ys = plan.restored_columns(
+            request.reference_frame,
+            pallet=request.pallet,
+            overhang_x=request.overhang_x,
+            overhang_y=request.overhang_y,
+        )
         collisions: List[Collision] = []
-        collisions.extend(self._check_pallet_bounds(plan, request))
-        collisions.extend(self._check_overlap(plan, request))
+        collisions.extend(self._check_pallet_bounds(plan, request, xs, ys))
+        collisions.extend(self._check_overlap(plan, request, xs, ys))
         return collisions
 
     def _box_footprint(self, plan: LayerPlan, request: LayerRequest) -> tuple[float, float]:
@@ -28,47 +38,53 @@ class CollisionChecker:
             return box_dims.width, box_dims.depth
         return box_dims.depth, box_dims.width
 
-    def _check_pallet_bounds(self, plan: LayerPlan, request: LayerRequest) -> Iterable[Collision]:
-        limit_x = request.pallet.dimensions.width + request.overhang_x * 2
-        limit_y = request.pallet.dimensions.depth + request.overhang_y * 2
+    def _check_pallet_bounds(
+        self,
+        plan: LayerPlan,
+        request: LayerRequest,
+        xs: Sequence[float],
+        ys: Sequence[float],
+    ) -> Iterable[Collision]:
         width, depth = self._box_footprint(plan, request)
         half_width = width / 2
         half_depth = depth / 2
-        for placement in plan.placements:
-            coord = self._usable_coordinates(placement, request)
-            x_min = coord.x - half_width
-            x_max = coord.x + half_width
-            y_min = coord.y - half_depth
-            y_max = coord.y + half_depth
-            if x_min < -self.clearance or x_max > limit_x + self.clearance:
-                yield Collision(f"Box {placement.sequence_index} exceeds pallet width limits")
-            if y_min < -self.clearance or y_max > limit_y + self.clearance:
-                yield Collision(f"Box {placement.sequence_index} exceeds pallet depth limits")
+        low = -self.clearance
+        high_x = request.pallet.dimensions.width + request.overhang_x * 2 + self.clearance
+        high_y = request.pallet.dimensions.depth + request.overhang_y * 2 + self.clearance
+        for index, x, y in zip(plan.as_arrays().sequence_index, xs, ys):
+            if x - half_width < low or x + half_width > high_x:
+                yield Collision(f"Box {index} exceeds pallet width limits")
+            if y - half_depth < low or y + half_depth > high_y:
+                yield Collision(f"Box {index} exceeds pallet depth limits")
 
-    def _check_overlap(self, plan: LayerPlan, request: LayerRequest) -> Iterable[Collision]:
-        items = plan.placements
+    def _check_overlap(
+        self,
+        plan: LayerPlan,
+        request: LayerRequest,
+        xs: Sequence[float],
+        ys: Sequence[float],
+    ) -> Iterable[Collision]:
+        indices = plan.as_arrays().sequence_index
         width, depth = self._box_footprint(plan, request)
-        coords = [
-            (placement, self._usable_coordinates(placement, request))
-            for placement in items
-        ]
-        for i, (first, first_coord) in enumerate(coords):
-            for second, second_coord in coords[i + 1 :]:
-                if self._overlap(first_coord, second_coord, width, depth):
-                    yield Collision(
-                        f"Collision between {first.sequence_index} and {second.sequence_index}"
-                    )
+        for i, j in _grid_overlaps(xs, ys, width - self.clearance, depth - self.clearance):
+            yield Collision(f"Collision between {indices[i]} and {indices[j]}")
 
-    def _overlap(self, a: Vector3, b: Vector3, width: float, depth: float) -> bool:
-        return (
-            abs(a.x - b.x) < width - self.clearance
-            and abs(a.y - b.y) < depth - self.clearance
-        )
 
-    def _usable_coordinates(self, placement: LayerPlacement, request: LayerRequest) -> Vector3:
-        return request.reference_frame.restore(
-            placement.position,
-            pallet=request.pallet,
-            overhang_x=request.overhang_x,
-            overhang_y=request.overhang_y,
-        )
+def _grid_overlaps(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    reach_x: float,
+    reach_y: float,
+) -> List[tuple[int, int]]:
+    """Return the sorted ``(i, j)`` pairs whose centres are closer than the reach.
+
+    The grid cells are one reach wide, so two overlapping boxes always sit in
+    the same or in adjacent cells.
+    """
+    if reach_x <= 0 or reach_y <= 0:
+        return []
+
+    def overlaps(first: int, second: int) -> bool:
+        return abs(xs[first] - xs[second]) < reach_x and abs(ys[first] - ys[second]) < reach_y
+
+    return grid_pairs(xs, ys, reach_x, reach_y, overlaps)
@@ -1,9 +1,10 @@
 """Helpers to model multi-grip (presa multipla) configurations."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
+from ._broadphase import grid_pairs
 from .models import Pallet, Vector3
 
 
@@ -65,6 +66,15 @@ class MultiGripDefinition:
 class MultiGripLayout:
     definition: MultiGripDefinition
     fingers: List[GripperFinger]
+    finger_bounds: tuple[tuple[float, float, float, float], ...] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # (x_min, x_max, y_min, y_max) per finger, computed once for collision checks.
+        object.__setattr__(
+            self, "finger_bounds", tuple(_finger_bounds(finger) for finger in self.fingers)
+        )
 
     def envelope(self) -> tuple[float, float]:
         return self.definition.envelope()
@@ -92,56 +102,81 @@ def build_layout(definition: MultiGripDefinition, origin: Vector3 | None = None)
     envelope_w, envelope_d = definition.envelope()
     start_x = origin.x - envelope_w / 2
     start_y = origin.y - envelope_d / 2
-    fingers: List[GripperFinger] = []
-    index = 1
-    for row in range(definition.rows):
-        for col in range(definition.cols):
-            center_x = start_x + definition.finger_width / 2 + col * max(definition.spacing_x, 0.0)
-            center_y = start_y + definition.finger_depth / 2 + row * max(definition.spacing_y, 0.0)
-            finger = GripperFinger(
-                index=index,
-                row=row + 1,
-                col=col + 1,
-                center=Vector3(center_x, center_y, origin.z),
-                width=definition.finger_width,
-                depth=definition.finger_depth,
-                height=definition.finger_height,
-            )
-            fingers.append(finger)
-            index += 1
+    # validate() guarantees non-negative spacing, so no clamping is needed here.
+    # Centres lie on a lattice: compute each column X and row Y once.
+    first_x = start_x + definition.finger_width / 2
+    first_y = start_y + definition.finger_depth / 2
+    xs = [first_x + col * definition.spacing_x for col in range(definition.cols)]
+    ys = [first_y + row * definition.spacing_y for row in range(definition.rows)]
+    fingers = [
+        GripperFinger(
+            index=row * definition.cols + col + 1,
+            row=row + 1,
+            col=col + 1,
+            center=Vector3(center_x, center_y, origin.z),
+            width=definition.finger_width,
+            depth=definition.finger_depth,
+            height=definition.finger_height,
+        )
+        for row, center_y in enumerate(ys)
+        for col, center_x in enumerate(xs)
+    ]
     return MultiGripLayout(definition=definition, fingers=fingers)
 
 
 def evaluate_envelope(layout: MultiGripLayout, pallet: Pallet, overhang_x: float, overhang_y: float) -> list[str]:
     """Return warnings if the grip envelope violates pallet boundaries."""
 
-    warnings: list[str] = []
     width, depth = layout.envelope()
-    limit_x = pallet.dimensions.width + overhang_x * 2
-    limit_y = pallet.dimensions.depth + overhang_y * 2
-    if width > limit_x:
-        warnings.append(
-            "Ingombro pinza oltre il limite lungo X: {:.1f}mm > {:.1f}mm".format(width, limit_x)
+    return _limit_warnings(
+        (
+            (_PALLET_X, width, pallet.dimensions.width + overhang_x * 2),
+            (_PALLET_Y, depth, pallet.dimensions.depth + overhang_y * 2),
         )
-    if depth > limit_y:
-        warnings.append(
-            "Ingombro pinza oltre il limite lungo Y: {:.1f}mm > {:.1f}mm".format(depth, limit_y)
+    )
+
+
+def evaluate_gripper_constraints(
+    layout: MultiGripLayout,
+    pallet: Pallet,
+    overhang_x: float,
+    overhang_y: float,
+    tool_width: float | None,
+    tool_depth: float | None,
+) -> list[str]:
+    """Check the envelope against pallet and tool limits in a single pass."""
+
+    width, depth = layout.envelope()
+    return _limit_warnings(
+        (
+            (_PALLET_X, width, pallet.dimensions.width + overhang_x * 2),
+            (_PALLET_Y, depth, pallet.dimensions.depth + overhang_y * 2),
+            (_TOOL_X, width, tool_width),
+            (_TOOL_Y, depth, tool_depth),
         )
-    return warnings
+    )
 
 
 def detect_finger_collisions(layout: MultiGripLayout) -> list[str]:
     """Return warnings whenever two finger footprints overlap."""
 
-    warnings: list[str] = []
-    for idx, current in enumerate(layout.fingers):
-        c_bounds = _finger_bounds(current)
-        for contender in layout.fingers[idx + 1 :]:
-            if _rects_overlap(c_bounds, _finger_bounds(contender)):
-                warnings.append(
-                    f"Collisione dita tra F{current.index} e F{contender.index}"
-                )
-    return warnings
+    fingers = layout.fingers
+    if len(fingers) < 2:
+        return []
+    bounds = layout.finger_bounds
+    # Overlapping fingers have centres closer than the widest finger, so they
+    # always fall in the same or in adjacent cells of this grid.
+    pairs = grid_pairs(
+        [finger.center.x for finger in fingers],
+        [finger.center.y for finger in fingers],
+        max(finger.width for finger in fingers),
+        max(finger.depth for finger in fingers),
+        lambda first, second: _rects_overlap(bounds[first], bounds[second]),
+    )
+    return [
+        f"Collisione dita tra F{fingers[first].index} e F{fingers[second].index}"
+        for first, second in pairs
+    ]
 
 
 def evaluate_tool_clearance(
@@ -151,21 +186,22 @@ def evaluate_tool_clearance(
 ) -> list[str]:
     """Warn if the layout envelope exceeds the usable tool window."""
 
-    warnings: list[str] = []
     width, depth = layout.envelope()
-    if tool_width is not None and width > tool_width:
-        warnings.append(
-            "Ingombro pinza oltre il limite tool lungo X: {:.1f}mm > {:.1f}mm".format(
-                width, tool_width
-            )
-        )
-    if tool_depth is not None and depth > tool_depth:
-        warnings.append(
-            "Ingombro pinza oltre il limite tool lungo Y: {:.1f}mm > {:.1f}mm".format(
-                depth, tool_depth
-            )
-        )
-    return warnings
+    return _limit_warnings(((_TOOL_X, width, tool_width), (_TOOL_Y, depth, tool_depth)))
+
+
+_PALLET_X = "Ingombro pinza oltre il limite lungo X: {:.1f}mm > {:.1f}mm"
+_PALLET_Y = "Ingombro pinza oltre il limite lungo Y: {:.1f}mm > {:.1f}mm"
+_TOOL_X = "Ingombro pinza oltre il limite tool lungo X: {:.1f}mm > {:.1f}mm"
+_TOOL_Y = "Ingombro pinza oltre il limite tool lungo Y: {:.1f}mm > {:.1f}mm"
+
+
+def _limit_warnings(checks: tuple[tuple[str, float, float | None], ...]) -> list[str]:
+    return [
+        message.format(actual, limit)
+        for message, actual, limit in checks
+        if limit is not None and actual > limit
+    ]
 
 
 def _finger_bounds(finger: GripperFinger) -> tuple[float, float, float, float]:
@@ -1,7 +1,9 @@
 """Graphical interface helpers for VerPal."""
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Iterable, Sequence
 
@@ -15,7 +17,6 @@ from .models import (
     Box,
     Interleaf,
     LayerPlan,
-    LayerPlacement,
     LayerRequest,
     LayerSequencePlan,
     Pallet,
@@ -28,7 +29,7 @@ from .planner import RecursiveFiveBlockPlanner
 from .sequence import LayerSequencePlanner
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlacementGlyph:
     """Representation of a placement projected on a 2D canvas."""
 
@@ -41,25 +42,68 @@ class PlacementGlyph:
     color: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LayerViewModel:
-    """Snapshot of a layer converted to drawable primitives."""
+    """Snapshot of a layer converted to drawable primitives.
+
+    Glyphs are stored column-wise, one entry per placement index; indexing
+    and :attr:`placements` build :class:`PlacementGlyph` records on demand.
+    """
 
     pallet_width: float
     pallet_depth: float
     overhang_x: float
     overhang_y: float
-    placements: list[PlacementGlyph]
+    x: array
+    y: array
+    z: array
+    widths: array
+    depths: array
+    rotations: array
+    blocks: tuple[str, ...]
+    colors: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, index: int) -> PlacementGlyph:
+        return PlacementGlyph(
+            index,
+            self.blocks[index],
+            Vector3(self.x[index], self.y[index], self.z[index]),
+            self.widths[index],
+            self.depths[index],
+            self.rotations[index],
+            self.colors[index],
+        )
+
+    @property
+    def placements(self) -> list[PlacementGlyph]:
+        return [
+            PlacementGlyph(idx, block, Vector3(x, y, z), width, depth, rotation, color)
+            for idx, (x, y, z, width, depth, rotation, block, color) in enumerate(
+                zip(
+                    self.x,
+                    self.y,
+                    self.z,
+                    self.widths,
+                    self.depths,
+                    self.rotations,
+                    self.blocks,
+                    self.colors,
+                )
+            )
+        ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HeightRow:
     label: str
     base: float
     top: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MetricLine:
     """Single entry used to show metric summaries inside the GUI."""
 
@@ -80,35 +124,58 @@ _COLOR_PALETTE = [
 
 
 def build_layer_view_model(plan: LayerPlan, request: LayerRequest) -> LayerViewModel:
-    """Convert the layer plan into drawable glyphs."""
+    """Convert the layer plan into drawable glyphs.
 
+    The last view model is reused while the plan's columnar arrays and the
+    request are unchanged; editing a placement rebuilds the arrays and so the
+    view model. Callers must treat the result as read-only.
+    """
+
+    global _last_view_model
+    key = (plan.as_arrays(), request)
+    if _last_view_model is not None and _same_objects(_last_view_model[0], key):
+        return _last_view_model[1]
+    view_model = _build_layer_view_model(plan, request)
+    _last_view_model = (key, view_model)
+    return view_model
+
+
+def _build_layer_view_model(plan: LayerPlan, request: LayerRequest) -> LayerViewModel:
     frame = request.reference_frame
-    placements: list[PlacementGlyph] = []
-    for idx, placement in enumerate(plan.placements):
-        physical = frame.restore(
-            placement.position,
-            pallet=request.pallet,
-            overhang_x=request.overhang_x,
-            overhang_y=request.overhang_y,
-        )
-        width, depth = _box_footprint(request.box.dimensions.width, request.box.dimensions.depth, placement.rotation)
-        placements.append(
-            PlacementGlyph(
-                placement_index=idx,
-                block=placement.block,
-                center=physical,
-                width=width,
-                depth=depth,
-                rotation=placement.rotation,
-                color=_color_for_block(placement.block, idx),
-            )
-        )
+    arrays = plan.as_arrays()
+    box_width = request.box.dimensions.width
+    box_depth = request.box.dimensions.depth
+    footprints = {
+        rotation: _box_footprint(box_width, box_depth, rotation) for rotation in set(arrays.rotation)
+    }
+    colors = _block_colors(arrays.block)
+    # Restore the coordinate columns in one batch; the plan caches them so the
+    # collision check of the same layer has usually done this already.
+    xs, ys = plan.restored_columns(
+        frame,
+        pallet=request.pallet,
+        overhang_x=request.overhang_x,
+        overhang_y=request.overhang_y,
+    )
+    extents = list(zip(*map(footprints.__getitem__, arrays.rotation))) or [(), ()]
     return LayerViewModel(
         pallet_width=request.pallet.dimensions.width,
         pallet_depth=request.pallet.dimensions.depth,
         overhang_x=request.overhang_x,
         overhang_y=request.overhang_y,
-        placements=placements,
+        # x/y are copied: the canvas moves dropped glyphs in place, and the
+        # restored columns belong to the plan's cache.
+        x=array("d", xs),
+        y=array("d", ys),
+        z=arrays.z,
+        widths=array("d", extents[0]),
+        depths=array("d", extents[1]),
+        rotations=arrays.rotation,
+        blocks=arrays.block,
+        colors=tuple(
+            colors[block] if block else _color_for_block(block, idx)
+            for idx, block in enumerate(arrays.block)
+        ),
     )
 
 
@@ -119,22 +186,25 @@ def compute_height_report(
 ) -> list[HeightRow]:
     """Return the base/top quota for each layer in the plan."""
 
-    rows: list[HeightRow] = []
     layers: Iterable[LayerPlan]
     if sequence is not None:
         layers = sequence.layers
     else:
         layers = [plan]
+    bases = tuple(_layer_base(layer) for layer in layers)
+    return list(_height_rows(request.box.dimensions.height, bases))
 
-    for idx, layer in enumerate(layers, start=1):
-        base = _layer_base(layer)
-        top = base + request.box.dimensions.height
-        rows.append(HeightRow(label=f"Layer {idx}", base=base, top=top))
 
+@lru_cache(maxsize=64)
+def _height_rows(box_height: float, bases: tuple[float, ...]) -> tuple[HeightRow, ...]:
+    rows = [
+        HeightRow(label=f"Layer {idx}", base=base, top=base + box_height)
+        for idx, base in enumerate(bases, start=1)
+    ]
     if rows:
         total_top = max(row.top for row in rows)
         rows.append(HeightRow(label="Totale", base=0.0, top=total_top))
-    return rows
+    return tuple(rows)
 
 
 def build_metric_summary(
@@ -143,6 +213,21 @@ def build_metric_summary(
 ) -> list[MetricLine]:
     """Return formatted metric rows for the active layer or sequence."""
 
+    global _last_metric_summary
+    layers = sequence.layers if sequence is not None else [plan]
+    key = (
+        sequence,
+        len(sequence.interleaves) if sequence is not None else 0,
+        *(part for layer in layers for part in (layer.as_arrays(), layer.box)),
+    )
+    if _last_metric_summary is not None and _same_objects(_last_metric_summary[0], key):
+        return list(_last_metric_summary[1])
+    lines = _build_metric_summary(plan, sequence)
+    _last_metric_summary = (key, tuple(lines))
+    return lines
+
+
+def _build_metric_summary(plan: LayerPlan, sequence: LayerSequencePlan | None) -> list[MetricLine]:
     if sequence is not None:
         metrics = compute_sequence_metrics(sequence)
         lines: list[MetricLine] = [
@@ -186,10 +271,25 @@ def _box_footprint(width: float, depth: float, rotation: int) -> tuple[float, fl
     return depth, width
 
 
+# Single-entry memos keyed on object identity: the keys hold the plan arrays,
+# which are replaced whenever placements are edited, so a stale hit is not
+# possible while the referenced objects are kept alive here.
+_last_view_model: tuple[tuple, LayerViewModel] | None = None
+_last_metric_summary: tuple[tuple, tuple[MetricLine, ...]] | None = None
+
+
+def _same_objects(cached: tuple, key: tuple) -> bool:
+    return len(cached) == len(key) and all(a is b for a, b in zip(cached, key))
+
+
 def _layer_base(layer: LayerPlan) -> float:
-    if not layer.placements:
-        return 0.0
-    return min(placement.position.z for placement in layer.placements)
+    return min(layer.as_arrays().z, default=0.0)
+
+
+def _block_colors(blocks: Iterable[str]) -> dict[str, str]:
+    """Resolve the palette colour of each distinct named block once."""
+
+    return {block: _color_for_block(block, 0) for block in set(blocks) if block}
 
 
 def _color_for_block(block: str, idx: int) -> str:
@@ -241,6 +341,9 @@ def _build_canvas_class(tk_module):  # pragma: no cover - GUI wiring
             self._on_status = on_status
             self._drag_tag: str | None = None
             self._drag_start: tuple[int, int] | None = None
+            self._pallet_id: int | None = None
+            self._item_ids: dict[int, tuple[int, int]] = {}
+            self._item_colors: dict[int, str] = {}
             self._margin = 24
             self._scale = 1.0
             self._draw()
@@ -252,7 +355,6 @@ def _build_canvas_class(tk_module):  # pragma: no cover - GUI wiring
             self._draw()
 
         def _draw(self) -> None:
-            self.delete("all")
             self.view_model = build_layer_view_model(self.plan, self.request)
             usable_width = self.view_model.pallet_width + self.view_model.overhang_x * 2
             usable_depth = self.view_model.pallet_depth + self.view_model.overhang_y * 2
@@ -265,42 +367,77 @@ def _build_canvas_class(tk_module):  # pragma: no cover - GUI wiring
             if self._scale <= 0:
                 self._scale = 1.0
 
-            pallet_x1 = self._mm_to_px(0.0, axis="x")
-            pallet_y1 = self._mm_to_px(0.0, axis="y")
-            pallet_x2 = self._mm_to_px(self.view_model.pallet_width, axis="x")
-            pallet_y2 = self._mm_to_px(self.view_model.pallet_depth, axis="y")
-            self.create_rectangle(
-                pallet_x1,
-                pallet_y1,
-                pallet_x2,
-                pallet_y2,
-                outline="#9aa5b1",
-                fill="#dfe7ec",
-                tags=("pallet",),
+            pallet_box = (
+                self._mm_to_px(0.0, axis="x"),
+                self._mm_to_px(0.0, axis="y"),
+                self._mm_to_px(self.view_model.pallet_width, axis="x"),
+                self._mm_to_px(self.view_model.pallet_depth, axis="y"),
             )
-
-            for glyph in self.view_model.placements:
-                tag = f"placement-{glyph.placement_index}"
-                x1 = self._mm_to_px(glyph.center.x - glyph.width / 2, axis="x")
-                y1 = self._mm_to_px(glyph.center.y - glyph.depth / 2, axis="y")
-                x2 = self._mm_to_px(glyph.center.x + glyph.width / 2, axis="x")
-                y2 = self._mm_to_px(glyph.center.y + glyph.depth / 2, axis="y")
-                self.create_rectangle(
-                    x1,
-                    y1,
-                    x2,
-                    y2,
-                    fill=glyph.color,
-                    outline="#374151",
-                    tags=("placement", tag),
-                )
-                self.create_text(
-                    (x1 + x2) / 2,
-                    (y1 + y2) / 2,
-                    text=str(glyph.placement_index + 1),
-                    fill="#ffffff",
-                    tags=("placement", tag),
+            if self._pallet_id is None:
+                self._pallet_id = self.create_rectangle(
+                    *pallet_box,
+                    outline="#9aa5b1",
+                    fill="#dfe7ec",
+                    tags=("pallet",),
                 )
+            else:
+                self.coords(self._pallet_id, *pallet_box)
+
+            # Canvas items are pooled per placement index: existing ones are
+            # only re-coordinated, so a redraw does not recreate every item.
+            view = self.view_model
+            margin = self._margin
+            scale = self._scale
+            offset_x = self.request.overhang_x
+            offset_y = self.request.overhang_y
+            x1s = [margin + (x - w / 2 + offset_x) * scale for x, w in zip(view.x, view.widths)]
+            x2s = [margin + (x + w / 2 + offset_x) * scale for x, w in zip(view.x, view.widths)]
+            y1s = [margin + (y - d / 2 + offset_y) * scale for y, d in zip(view.y, view.depths)]
+            y2s = [margin + (y + d / 2 + offset_y) * scale for y, d in zip(view.y, view.depths)]
+            stale = dict(self._item_ids)
+            for index, (x1, y1, x2, y2, color) in enumerate(zip(x1s, y1s, x2s, y2s, view.colors)):
+                items = stale.pop(index, None)
+                if items is None:
+                    tag = f"placement-{index}"
+                    rect_id = self.create_rectangle(
+                        x1,
+                        y1,
+                        x2,
+                        y2,
+                        fill=color,
+                        outline="#374151",
+                        tags=("placement", tag),
+                    )
+                    text_id = self.create_text(
+                        (x1 + x2) / 2,
+                        (y1 + y2) / 2,
+                        text=str(index + 1),
+                        fill="#ffffff",
+                        tags=("placement", tag),
+                    )
+                    self._item_ids[index] = (rect_id, text_id)
+                else:
+                    rect_id, text_id = items
+                    self.coords(rect_id, x1, y1, x2, y2)
+                    self.coords(text_id, (x1 + x2) / 2, (y1 + y2) / 2)
+                    if self._item_colors.get(index) != color:
+                        self.itemconfigure(rect_id, fill=color)
+                self._item_colors[index] = color
+            for index, items in stale.items():
+                self.delete(*items)
+                del self._item_ids[index]
+                self._item_colors.pop(index, None)
+
+        def _item_box(self, index: int) -> tuple[float, float, float, float]:
+            view = self.view_model
+            half_width = view.widths[index] / 2
+            half_depth = view.depths[index] / 2
+            return (
+                self._mm_to_px(view.x[index] - half_width, axis="x"),
+                self._mm_to_px(view.y[index] - half_depth, axis="y"),
+                self._mm_to_px(view.x[index] + half_width, axis="x"),
+                self._mm_to_px(view.y[index] + half_depth, axis="y"),
+            )
 
         def _on_press(self, event) -> None:
             current = self.find_withtag("current")
@@ -343,6 +480,14 @@ def _build_canvas_class(tk_module):  # pragma: no cover - GUI wiring
                 overhang_y=self.request.overhang_y,
             )
             placement.position = Vector3(transformed.x, transformed.y, transformed.z)
+            # The view model is shared with the memo, so rebuild it from the
+            # edited plan rather than patching it, then snap only the dropped
+            # items instead of recreating every rectangle and label.
+            self.view_model = build_layer_view_model(self.plan, self.request)
+            rect_id, text_id = self._item_ids[placement_index]
+            x1, y1, x2, y2 = self._item_box(placement_index)
+            self.coords(rect_id, x1, y1, x2, y2)
+            self.coords(text_id, (x1 + x2) / 2, (y1 + y2) / 2)
             if self._on_status is not None:
                 self._on_status(
                     "Placement #{idx} -> X={x:.1f}mm Y={y:.1f}mm".format(
@@ -409,6 +554,7 @@ class PalletGuiApp:
             label_offset=default_label_offset,
         )
         self._annotations: list[PlacementAnnotation] = []
+        self._refresh_pending = False
 
         tk_module, messagebox, ttk, filedialog = _import_tk()
         Figure, FigureCanvasTkAgg, Poly3DCollection = _import_matplotlib()
@@ -724,7 +870,15 @@ class PalletGuiApp:
         self.root.mainloop()
 
     def _on_canvas_change(self, _plan: LayerPlan) -> None:  # pragma: no cover - UI callback
-        self.canvas.refresh()
+        # Coalesce bursts of drops into a single refresh once Tk is idle.
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after_idle(self._do_refresh)
+
+    def _do_refresh(self) -> None:  # pragma: no cover - UI callback
+        self._refresh_pending = False
+        # The canvas has already moved the dropped placement in place.
         self._refresh_annotations()
         self._refresh_metrics()
         self._render_3d()
@@ -801,8 +955,11 @@ class PalletGuiApp:
             layers = [self.plan]
 
         for layer in layers:
-            for placement in layer.placements:
-                self._draw_box(placement)
+            view = _build_layer_view_model(layer, self.request)
+            for x, y, z, width, depth, color in zip(
+                view.x, view.y, view.z, view.widths, view.depths, view.colors
+            ):
+                self._draw_box(x - width / 2, y - depth / 2, z, width, depth, color)
         for annotation in self._annotations:
             label_pos = self._restore_position(annotation.label_position)
             self.ax.scatter(
@@ -941,23 +1098,10 @@ class PalletGuiApp:
             return None
         return float(text)
 
-    def _draw_box(self, placement: LayerPlacement) -> None:  # pragma: no cover - UI drawing
-        physical = self.request.reference_frame.restore(
-            placement.position,
-            pallet=self.request.pallet,
-            overhang_x=self.request.overhang_x,
-            overhang_y=self.request.overhang_y,
-        )
-        width, depth = _box_footprint(
-            self.request.box.dimensions.width,
-            self.request.box.dimensions.depth,
-            placement.rotation,
-        )
+    def _draw_box(
+        self, x0: float, y0: float, z0: float, width: float, depth: float, color: str
+    ) -> None:  # pragma: no cover - UI drawing
         height = self.request.box.dimensions.height
-        x0 = physical.x - width / 2
-        y0 = physical.y - depth / 2
-        z0 = placement.position.z
-
         vertices = [
             (x0, y0, z0),
             (x0 + width, y0, z0),
@@ -976,7 +1120,6 @@ class PalletGuiApp:
             [vertices[i] for i in [2, 3, 7, 6]],
             [vertices[i] for i in [3, 0, 4, 7]],
         ]
-        color = _color_for_block(placement.block, placement.sequence_index)
         poly = self._Poly3DCollection(faces, facecolors=color, edgecolors="#111827", linewidths=0.5, alpha=0.6)
         self.ax.add_collection3d(poly)
 
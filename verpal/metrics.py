@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Tuple
+from operator import add, mul, sub
+from typing import Sequence
 
-from .models import Box, Dimensions, LayerPlan, LayerPlacement, LayerSequencePlan, Vector3
+from .models import Box, LayerPlan, LayerSequencePlan, Vector3
 
 
 @dataclass(frozen=True)
@@ -29,11 +30,7 @@ class SequenceMetrics(LayerMetrics):
 def compute_layer_metrics(plan: LayerPlan) -> LayerMetrics:
     """Compute aggregate metrics for a single layer plan."""
 
-    entries: list[tuple[LayerPlacement, Box | None]] = [
-        (placement, plan.box)
-        for placement in plan.placements
-    ]
-    total_boxes, total_weight, center, width, depth, height = _accumulate(entries)
+    total_boxes, total_weight, center, width, depth, height = _accumulate(_layer_columns(plan))
     return LayerMetrics(
         total_boxes=total_boxes,
         total_weight=total_weight,
@@ -47,31 +44,22 @@ def compute_layer_metrics(plan: LayerPlan) -> LayerMetrics:
 def compute_sequence_metrics(sequence: LayerSequencePlan) -> SequenceMetrics:
     """Compute aggregate metrics for a stacked sequence of layers."""
 
-    entries: list[tuple[LayerPlacement, Box | None]] = []
-    box_count = 0
+    columns: list[list[float]] = [[] for _ in range(7)]
     for layer in sequence.layers:
-        box_count += len(layer.placements)
-        entries.extend((placement, layer.box) for placement in layer.placements)
+        for column, values in zip(columns, _layer_columns(layer)):
+            column.extend(values)
+    box_count = len(columns[0])
+    xs, ys, zs, half_ws, half_ds, half_hs, weights = columns
     for entry in sequence.interleaves:
-        pseudo_box = Box(
-            id=f"interleaf-{entry.interleaf.id}",
-            dimensions=Dimensions(width=0.0, depth=0.0, height=entry.interleaf.thickness),
-            weight=entry.interleaf.weight,
-            label_position="top",
-        )
-        pseudo_placement = LayerPlacement(
-            box_id=pseudo_box.id,
-            position=Vector3(
-                x=0.0,
-                y=0.0,
-                z=entry.z_position + entry.interleaf.thickness / 2,
-            ),
-            rotation=0,
-            block="interleaf",
-            sequence_index=-entry.level,
-        )
-        entries.append((pseudo_placement, pseudo_box))
-    total_boxes, total_weight, center, width, depth, height = _accumulate(entries)
+        half_thickness = entry.interleaf.thickness / 2
+        xs.append(0.0)
+        ys.append(0.0)
+        zs.append(entry.z_position + half_thickness)
+        half_ws.append(0.0)
+        half_ds.append(0.0)
+        half_hs.append(half_thickness)
+        weights.append(entry.interleaf.weight)
+    total_boxes, total_weight, center, width, depth, height = _accumulate(columns)
     return SequenceMetrics(
         total_boxes=box_count,
         total_weight=total_weight,
@@ -83,54 +71,50 @@ def compute_sequence_metrics(sequence: LayerSequencePlan) -> SequenceMetrics:
     )
 
 
-def _accumulate(entries: Iterable[Tuple[LayerPlacement, Box | None]]):
-    entries = list(entries)
-    if not entries:
+# x, y, z, half width, half depth, half height, weight
+_Columns = Sequence[Sequence[float]]
+
+
+def _layer_columns(plan: LayerPlan) -> _Columns:
+    """Return the metric columns of ``plan`` built from its cached arrays."""
+
+    arrays = plan.as_arrays()
+    factors: dict[int, tuple[float, float, float, float]] = {}
+    for rotation in set(arrays.rotation):
+        width, depth, height, weight = _placement_factors(plan.box, rotation)
+        factors[rotation] = (width / 2, depth / 2, height / 2, weight)
+    extents = list(zip(*map(factors.__getitem__, arrays.rotation))) or [(), (), (), ()]
+    return (arrays.x, arrays.y, arrays.z, *extents)
+
+
+def _accumulate(columns: _Columns):
+    xs, ys, zs, half_ws, half_ds, half_hs, weights = columns
+    count = len(xs)
+    if not count:
         return 0, 0.0, Vector3(0.0, 0.0, 0.0), 0.0, 0.0, 0.0
 
-    min_x = float("inf")
-    max_x = float("-inf")
-    min_y = float("inf")
-    max_y = float("-inf")
-    min_bottom = float("inf")
-    max_top = float("-inf")
-    weighted_x = 0.0
-    weighted_y = 0.0
-    weighted_z = 0.0
-    total_weight = 0.0
-    fallback_count = len(entries)
-
-    for placement, box in entries:
-        width, depth, height, weight = _placement_factors(box, placement.rotation)
-        half_w = width / 2
-        half_d = depth / 2
-        half_h = height / 2
-        min_x = min(min_x, placement.position.x - half_w)
-        max_x = max(max_x, placement.position.x + half_w)
-        min_y = min(min_y, placement.position.y - half_d)
-        max_y = max(max_y, placement.position.y + half_d)
-        min_bottom = min(min_bottom, placement.position.z - half_h)
-        max_top = max(max_top, placement.position.z + half_h)
-        weighted_x += placement.position.x * weight
-        weighted_y += placement.position.y * weight
-        weighted_z += placement.position.z * weight
-        total_weight += weight
+    min_x = min(map(sub, xs, half_ws))
+    max_x = max(map(add, xs, half_ws))
+    min_y = min(map(sub, ys, half_ds))
+    max_y = max(map(add, ys, half_ds))
+    min_bottom = min(map(sub, zs, half_hs))
+    max_top = max(map(add, zs, half_hs))
+    total_weight = sum(weights, 0.0)
 
     if total_weight <= 0:
         # Fall back to the arithmetic mean if weights are missing
-        avg_x = sum(placement.position.x for placement, _ in entries) / fallback_count
-        avg_y = sum(placement.position.y for placement, _ in entries) / fallback_count
-        avg_z = sum(placement.position.z for placement, _ in entries) / fallback_count
+        center = Vector3(sum(xs) / count, sum(ys) / count, sum(zs) / count)
     else:
-        avg_x = weighted_x / total_weight
-        avg_y = weighted_y / total_weight
-        avg_z = weighted_z / total_weight
+        center = Vector3(
+            sum(map(mul, xs, weights), 0.0) / total_weight,
+            sum(map(mul, ys, weights), 0.0) / total_weight,
+            sum(map(mul, zs, weights), 0.0) / total_weight,
+        )
 
-    center = Vector3(avg_x, avg_y, avg_z)
     footprint_width = max(0.0, max_x - min_x)
     footprint_depth = max(0.0, max_y - min_y)
     max_height = max(0.0, max_top - min_bottom)
-    return len(entries), total_weight, center, footprint_width, footprint_depth, max_height
+    return count, total_weight, center, footprint_width, footprint_depth, max_height
 
 
 def _placement_factors(box: Box | None, rotation: int) -> tuple[float, float, float, float]:
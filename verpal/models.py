@@ -1,33 +1,37 @@
 """Domain models for VerPal."""
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Iterable, List, Sequence
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dimensions:
     width: float
     depth: float
     height: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vector3:
     x: float
     y: float
     z: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PickupOffset:
     x: float = 0.0
     y: float = 0.0
     z: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Box:
     id: str
     dimensions: Dimensions
@@ -35,7 +39,7 @@ class Box:
     label_position: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Pallet:
     id: str
     dimensions: Dimensions
@@ -43,7 +47,7 @@ class Pallet:
     max_overhang_y: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tool:
     id: str
     name: str
@@ -52,7 +56,7 @@ class Tool:
     pickup_offset: PickupOffset = field(default_factory=PickupOffset)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Interleaf:
     """Thin separator placed between pallet layers."""
 
@@ -69,6 +73,8 @@ class ReferenceFrame:
     origin: str = "SW"
     x_axis: str = "E"
     y_axis: str = "N"
+    _x_sign: int = field(default=1, init=False, repr=False, compare=False)
+    _y_sign: int = field(default=1, init=False, repr=False, compare=False)
 
     _VALID_ORIGINS = {"SW", "SE", "NW", "NE", "CENTER"}
 
@@ -89,6 +95,8 @@ class ReferenceFrame:
         object.__setattr__(self, "origin", origin)
         object.__setattr__(self, "x_axis", x_axis)
         object.__setattr__(self, "y_axis", y_axis)
+        object.__setattr__(self, "_x_sign", 1 if x_axis == "E" else -1)
+        object.__setattr__(self, "_y_sign", 1 if y_axis == "N" else -1)
 
     @property
     def axes_token(self) -> str:
@@ -104,14 +112,31 @@ class ReferenceFrame:
     ) -> Vector3:
         """Transform a position into the configured reference frame."""
 
-        base_x = position.x - overhang_x
-        base_y = position.y - overhang_y
-        origin = self._origin_point(pallet)
-        dx = base_x - origin.x
-        dy = base_y - origin.y
-        x_sign = 1 if self.x_axis == "E" else -1
-        y_sign = 1 if self.y_axis == "N" else -1
-        return Vector3(x=dx * x_sign, y=dy * y_sign, z=position.z)
+        origin_x, origin_y = _origin_offsets(self.origin, pallet.dimensions.width, pallet.dimensions.depth)
+        return Vector3(
+            x=(position.x - overhang_x - origin_x) * self._x_sign,
+            y=(position.y - overhang_y - origin_y) * self._y_sign,
+            z=position.z,
+        )
+
+    def transform_batch(
+        self,
+        xs: Iterable[float],
+        ys: Iterable[float],
+        *,
+        pallet: Pallet,
+        overhang_x: float,
+        overhang_y: float,
+    ) -> tuple[List[float], List[float]]:
+        """Transform coordinate columns into the configured reference frame."""
+
+        origin_x, origin_y = _origin_offsets(self.origin, pallet.dimensions.width, pallet.dimensions.depth)
+        x_sign = self._x_sign
+        y_sign = self._y_sign
+        return (
+            [(x - overhang_x - origin_x) * x_sign for x in xs],
+            [(y - overhang_y - origin_y) * y_sign for y in ys],
+        )
 
     def restore(
         self,
@@ -123,27 +148,46 @@ class ReferenceFrame:
     ) -> Vector3:
         """Restore a transformed position back to the usable pallet frame."""
 
-        origin = self._origin_point(pallet)
-        x_sign = 1 if self.x_axis == "E" else -1
-        y_sign = 1 if self.y_axis == "N" else -1
-        base_x = origin.x + (position.x / x_sign)
-        base_y = origin.y + (position.y / y_sign)
-        return Vector3(x=base_x + overhang_x, y=base_y + overhang_y, z=position.z)
-
-    def _origin_point(self, pallet: Pallet) -> Vector3:
-        width = pallet.dimensions.width
-        depth = pallet.dimensions.depth
-        if self.origin == "SW":
-            return Vector3(0.0, 0.0, 0.0)
-        if self.origin == "SE":
-            return Vector3(width, 0.0, 0.0)
-        if self.origin == "NW":
-            return Vector3(0.0, depth, 0.0)
-        if self.origin == "NE":
-            return Vector3(width, depth, 0.0)
-        if self.origin == "CENTER":
-            return Vector3(width / 2, depth / 2, 0.0)
-        raise ValueError(f"Unsupported origin '{self.origin}'")
+        origin_x, origin_y = _origin_offsets(self.origin, pallet.dimensions.width, pallet.dimensions.depth)
+        return Vector3(
+            x=origin_x + position.x * self._x_sign + overhang_x,
+            y=origin_y + position.y * self._y_sign + overhang_y,
+            z=position.z,
+        )
+
+    def restore_batch(
+        self,
+        xs: Iterable[float],
+        ys: Iterable[float],
+        *,
+        pallet: Pallet,
+        overhang_x: float,
+        overhang_y: float,
+    ) -> tuple[List[float], List[float]]:
+        """Restore transformed coordinate columns back to the usable pallet frame."""
+
+        origin_x, origin_y = _origin_offsets(self.origin, pallet.dimensions.width, pallet.dimensions.depth)
+        x_sign = self._x_sign
+        y_sign = self._y_sign
+        return (
+            [origin_x + x * x_sign + overhang_x for x in xs],
+            [origin_y + y * y_sign + overhang_y for y in ys],
+        )
+
+
+@lru_cache(maxsize=64)
+def _origin_offsets(origin: str, width: float, depth: float) -> tuple[float, float]:
+    if origin == "SW":
+        return 0.0, 0.0
+    if origin == "SE":
+        return width, 0.0
+    if origin == "NW":
+        return 0.0, depth
+    if origin == "NE":
+        return width, depth
+    if origin == "CENTER":
+        return width / 2, depth / 2
+    raise ValueError(f"Unsupported origin '{origin}'")
 
 
 class OrientationMode(str, Enum):
@@ -152,7 +196,7 @@ class OrientationMode(str, Enum):
     BOTH = "both"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApproachConfig:
     direction: str
     distance: float
@@ -187,7 +231,7 @@ class LayerRequest:
         return self.max_overhang_y if self.max_overhang_y is not None else self.pallet.max_overhang_y
 
 
-@dataclass
+@dataclass(slots=True)
 class LayerPlacement:
     box_id: str
     position: Vector3
@@ -195,6 +239,43 @@ class LayerPlacement:
     block: str
     sequence_index: int
 
+    @classmethod
+    def _unchecked(
+        cls,
+        box_id: str,
+        x: float,
+        y: float,
+        z: float,
+        rotation: int,
+        block: str,
+        sequence_index: int,
+    ) -> "LayerPlacement":
+        """Build a placement without the generated ``__init__``.
+
+        Reserved for planner hot paths whose inputs are already valid.
+        """
+        placement = object.__new__(cls)
+        placement.box_id = box_id
+        placement.position = Vector3(x, y, z)
+        placement.rotation = rotation
+        placement.block = block
+        placement.sequence_index = sequence_index
+        return placement
+
+
+_placement_fields = attrgetter("position", "rotation", "block", "sequence_index")
+
+
+class PlacementArrays(NamedTuple):
+    """Column view of the placements of a layer."""
+
+    x: array
+    y: array
+    z: array
+    rotation: array
+    block: tuple[str, ...]
+    sequence_index: array
+
 
 @dataclass
 class LayerPlan:
@@ -207,6 +288,93 @@ class LayerPlan:
     collisions: List[str] = field(default_factory=list)
     box: Box | None = None
     approach_overrides: Dict[str, ApproachConfig] = field(default_factory=dict)
+    _arrays: tuple[list, PlacementArrays] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _restored: tuple[PlacementArrays, tuple, tuple[List[float], List[float]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def as_arrays(self) -> PlacementArrays:
+        """Return the placements as cached coordinate/rotation/block/index columns.
+
+        The cache is keyed on the field values the columns are built from, so it
+        follows both a reassigned ``placements`` list and in-place edits of its
+        items such as ``placement.position = ...``.
+        """
+        placements = self.placements
+        fields = list(map(_placement_fields, placements))
+        cached = self._arrays
+        if cached is None or cached[0] != fields:
+            positions = [placement.position for placement in placements]
+            arrays = PlacementArrays(
+                x=array("d", [position.x for position in positions]),
+                y=array("d", [position.y for position in positions]),
+                z=array("d", [position.z for position in positions]),
+                rotation=array("h", [placement.rotation for placement in placements]),
+                block=tuple(placement.block for placement in placements),
+                sequence_index=array("l", [placement.sequence_index for placement in placements]),
+            )
+            cached = self._arrays = (fields, arrays)
+        return cached[1]
+
+    def restored_columns(
+        self,
+        frame: ReferenceFrame,
+        *,
+        pallet: Pallet,
+        overhang_x: float,
+        overhang_y: float,
+    ) -> tuple[List[float], List[float]]:
+        """Return the placement centres restored to the usable pallet frame.
+
+        The result is cached alongside :meth:`as_arrays`, so collision checks
+        and exporters working on the same plan restore the coordinates once.
+        """
+        arrays = self.as_arrays()
+        key = (frame, pallet, overhang_x, overhang_y)
+        cached = self._restored
+        if cached is None or cached[0] is not arrays or cached[1] != key:
+            columns = frame.restore_batch(
+                arrays.x, arrays.y, pallet=pallet, overhang_x=overhang_x, overhang_y=overhang_y
+            )
+            cached = self._restored = (arrays, key, columns)
+        return cached[2]
+
+    def invalidate_arrays(self) -> None:
+        self._arrays = None
+        self._restored = None
+
+    def mutate_positions(self, transform: Callable[[Vector3], Vector3]) -> None:
+        """Replace every placement position with ``transform(position)``."""
+        for placement in self.placements:
+            placement.position = transform(placement.position)
+        self.invalidate_arrays()
+
+    def copy(self) -> "LayerPlan":
+        """Return an independent copy whose placements and dicts may be mutated."""
+        return LayerPlan(
+            placements=[
+                LayerPlacement._unchecked(
+                    placement.box_id,
+                    placement.position.x,
+                    placement.position.y,
+                    placement.position.z,
+                    placement.rotation,
+                    placement.block,
+                    placement.sequence_index,
+                )
+                for placement in self.placements
+            ],
+            orientation=self.orientation,
+            fill_ratio=self.fill_ratio,
+            blocks=self.blocks.copy(),
+            start_corner=self.start_corner,
+            metadata=self.metadata.copy(),
+            collisions=self.collisions.copy(),
+            box=self.box,
+            approach_overrides=self.approach_overrides.copy(),
+        )
 
     def ordered_placements(self) -> List[LayerPlacement]:
         """Return placements ordered according to the start corner preference."""
@@ -242,18 +410,16 @@ class LayerSequencePlan:
 
     def max_height(self) -> float:
         """Return the highest z position reached by the sequence."""
-        highest = 0.0
-        for layer in self.layers:
-            if not layer.placements:
-                continue
-            layer_height = max(placement.position.z for placement in layer.placements)
-            highest = max(highest, layer_height)
-        for interleaf in self.interleaves:
-            highest = max(highest, interleaf.z_position + interleaf.interleaf.thickness)
-        return highest
+        return max(
+            chain(
+                (0.0,),
+                (placement.position.z for layer in self.layers for placement in layer.placements),
+                (entry.z_position + entry.interleaf.thickness for entry in self.interleaves),
+            )
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InterleafPlacement:
     """Metadata describing where a slip-sheet has been inserted."""
 
@@ -1,10 +1,11 @@
 """Recursive five-block planner implementation."""
 from __future__ import annotations
 
+from collections import Counter
 from math import floor
 from typing import Dict, List, Tuple
 
-from .models import LayerPlan, LayerPlacement, LayerRequest, Vector3
+from .models import LayerPlan, LayerPlacement, LayerRequest
 
 
 class RecursiveFiveBlockPlanner:
@@ -39,28 +40,19 @@ class RecursiveFiveBlockPlanner:
         if columns == 0 or rows == 0:
             return LayerPlan([], orientation, 0.0, {}, request.start_corner, {}, [], box=request.box)
 
-        placements: List[LayerPlacement] = []
         total_boxes = columns * rows
         fill_ratio = (total_boxes * width * depth) / (usable_width * usable_depth)
         offsets = self._start_offsets(usable_width, usable_depth, width, depth, columns, rows)
-        seq = 0
-        block_counts: Dict[str, int] = {}
-        for row in range(rows):
-            for col in range(columns):
-                block_name = self._block_name(row, col, rows, columns)
-                block_counts[block_name] = block_counts.get(block_name, 0) + 1
-                x = offsets[0] + col * width + width / 2
-                y = offsets[1] + row * depth + depth / 2
-                placements.append(
-                    LayerPlacement(
-                        box_id=request.box.id,
-                        position=Vector3(x=x, y=y, z=request.pickup_offset.z),
-                        rotation=orientation,
-                        block=block_name,
-                        sequence_index=seq,
-                    )
-                )
-                seq += 1
+        xs, ys = _grid_centers(columns, rows, width, depth, offsets)
+        row_blocks = self._row_blocks(rows, columns)
+        box_id = request.box.id
+        z = request.pickup_offset.z
+        placements = [
+            LayerPlacement._unchecked(box_id, x, y, z, orientation, block_name, row * columns + col)
+            for row, (y, blocks) in enumerate(zip(ys, row_blocks))
+            for col, (x, block_name) in enumerate(zip(xs, blocks))
+        ]
+        block_counts = dict(Counter(placement.block for placement in placements))
 
         metadata = {
             "columns": str(columns),
@@ -80,20 +72,25 @@ class RecursiveFiveBlockPlanner:
 
     def _apply_reference_frame(self, plan: LayerPlan, request: LayerRequest) -> LayerPlan:
         frame = request.reference_frame
+        placements = plan.placements
+        xs, ys = frame.transform_batch(
+            [placement.position.x for placement in placements],
+            [placement.position.y for placement in placements],
+            pallet=request.pallet,
+            overhang_x=request.overhang_x,
+            overhang_y=request.overhang_y,
+        )
         transformed = [
-            LayerPlacement(
-                box_id=placement.box_id,
-                position=frame.transform(
-                    placement.position,
-                    pallet=request.pallet,
-                    overhang_x=request.overhang_x,
-                    overhang_y=request.overhang_y,
-                ),
-                rotation=placement.rotation,
-                block=placement.block,
-                sequence_index=placement.sequence_index,
+            LayerPlacement._unchecked(
+                placement.box_id,
+                x,
+                y,
+                placement.position.z,
+                placement.rotation,
+                placement.block,
+                placement.sequence_index,
             )
-            for placement in plan.placements
+            for placement, x, y in zip(placements, xs, ys)
         ]
         plan.placements = transformed
         plan.metadata = {
@@ -103,6 +100,24 @@ class RecursiveFiveBlockPlanner:
         }
         return plan
 
+    def _row_blocks(self, rows: int, columns: int) -> List[List[str]]:
+        """Return the block name of every cell, row by row.
+
+        Block names only depend on whether a row is the first, the last or an
+        inner one, so each kind of row is resolved once and shared.
+        """
+        templates: Dict[int, List[str]] = {}
+        layout: List[List[str]] = []
+        for row in range(rows):
+            kind = 0 if row == 0 else 2 if row == rows - 1 else 1
+            template = templates.get(kind)
+            if template is None:
+                template = templates[kind] = [
+                    self._block_name(row, col, rows, columns) for col in range(columns)
+                ]
+            layout.append(template)
+        return layout
+
     def _block_name(self, row: int, col: int, rows: int, columns: int) -> str:
         is_left = col == 0
         is_right = col == columns - 1
@@ -133,3 +148,17 @@ class RecursiveFiveBlockPlanner:
         offset_x = (usable_width - total_width) / 2
         offset_y = (usable_depth - total_depth) / 2
         return offset_x, offset_y
+
+
+def _grid_centers(
+    columns: int,
+    rows: int,
+    width: float,
+    depth: float,
+    offsets: Tuple[float, float],
+) -> Tuple[List[float], List[float]]:
+    """Return the X centre of every column and the Y centre of every row."""
+    offset_x, offset_y = offsets
+    xs = [offset_x + col * width + width / 2 for col in range(columns)]
+    ys = [offset_y + row * depth + depth / 2 for row in range(rows)]
+    return xs, ys
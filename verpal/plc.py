@@ -36,13 +36,16 @@ class SiemensPLCExporter:
 
     def to_file(self, plan: LayerPlan | LayerSequencePlan, filename: str | Path) -> Path:
         path = Path(filename)
-        path.write_text(self._serialize(plan), encoding="utf-8")
+        path.write_bytes(self.to_payload(plan))
         return path
 
     def to_payload(self, plan: LayerPlan | LayerSequencePlan) -> bytes:
         return self._serialize(plan).encode("utf-8")
 
     def _serialize(self, plan: LayerPlan | LayerSequencePlan) -> str:
+        return "\n".join(self._format_lines(plan))
+
+    def _format_lines(self, plan: LayerPlan | LayerSequencePlan) -> list[str]:
         layers = plan.layers if isinstance(plan, LayerSequencePlan) else [plan]
         rows = self._build_rows(layers)
         metrics: LayerMetrics | SequenceMetrics
@@ -88,24 +91,8 @@ class SiemensPLCExporter:
         lines.append(
             "IDX;LAYER;BLOCK;X;Y;Z;ROT;APP_DIR;APP_DIST;LABEL_X;LABEL_Y;LABEL_Z"
         )
-        for row in rows:
-            lines.append(
-                "{idx};{layer};{block};{x:.2f};{y:.2f};{z:.2f};{rot};{ad};{dist:.2f};{lx};{ly};{lz}".format(
-                    idx=row.index,
-                    layer=row.layer,
-                    block=row.block,
-                    x=row.x,
-                    y=row.y,
-                    z=row.z,
-                    rot=row.rotation,
-                    ad=row.approach_direction or "",
-                    dist=row.approach_distance or 0.0,
-                    lx=f"{row.label_x:.2f}" if row.label_x is not None else "",
-                    ly=f"{row.label_y:.2f}" if row.label_y is not None else "",
-                    lz=f"{row.label_z:.2f}" if row.label_z is not None else "",
-                )
-            )
-        return "\n".join(lines)
+        lines.extend(map(_format_row, rows))
+        return lines
 
     def _build_rows(self, layers: Iterable[LayerPlan]) -> list[PLCRow]:
         rows: list[PLCRow] = []
@@ -136,4 +123,28 @@ class SiemensPLCExporter:
         return rows
 
 
+_ROW_TEMPLATE = "{};{};{};{:.2f};{:.2f};{:.2f};{};{};{:.2f};{};{};{}".format
+
+
+def _format_row(row: PLCRow) -> str:
+    return _ROW_TEMPLATE(
+        row.index,
+        row.layer,
+        row.block,
+        row.x,
+        row.y,
+        row.z,
+        row.rotation,
+        row.approach_direction or "",
+        row.approach_distance or 0.0,
+        _format_optional(row.label_x),
+        _format_optional(row.label_y),
+        _format_optional(row.label_z),
+    )
+
+
+def _format_optional(value: float | None) -> str:
+    return f"{value:.2f}" if value is not None else ""
+
+
 __all__ = ["PLCRow", "SiemensPLCExporter"]
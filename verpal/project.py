@@ -11,6 +11,25 @@ from zipfile import ZipFile, BadZipFile
 from .exporter import PlanExporter
 from .models import Box, Dimensions, LayerPlan, LayerSequencePlan, Pallet, Tool
 
+try:  # pragma: no cover - optional accelerator
+    import orjson
+except ImportError:  # pragma: no cover - fallback to the standard library
+    orjson = None
+
+
+def _json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any, *, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 
 @dataclass
 class PalletProject:
@@ -56,7 +75,7 @@ class PalletProject:
 
     def plan_data(self) -> dict[str, Any]:
         """Return the JSON payload as dictionary."""
-        return json.loads(self.plan_payload)
+        return _json_loads(self.plan_payload)
 
 
 class ProjectArchiver:
@@ -90,18 +109,19 @@ class ProjectArchiver:
         )
         return project
 
-    def save(self, project: PalletProject, target: str | Path) -> Path:
+    def save(self, project: PalletProject, target: str | Path, *, pretty: bool = False) -> Path:
+        """Write the project archive; ``pretty`` indents the metadata for manual inspection."""
         path = Path(target)
         path.parent.mkdir(parents=True, exist_ok=True)
         with ZipFile(path, "w") as archive:
-            archive.writestr("metadata.json", json.dumps(project.to_dict(), indent=2))
+            archive.writestr("metadata.json", _json_dumps(project.to_dict(), pretty=pretty))
             archive.writestr("plan.json", project.plan_payload)
         return path
 
     def load(self, archive_path: str | Path) -> PalletProject:
         try:
             with ZipFile(archive_path, "r") as archive:
-                metadata = json.loads(archive.read("metadata.json").decode("utf-8"))
+                metadata = _json_loads(archive.read("metadata.json"))
                 payload = archive.read("plan.json").decode("utf-8")
         except (FileNotFoundError, KeyError, BadZipFile) as exc:
             raise ValueError(f"Archivio non valido: {archive_path}") from exc
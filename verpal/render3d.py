@@ -159,14 +159,14 @@ def _export_layers_to_obj(
         if not layer.placements:
             continue
         box_dims = layer.box.dimensions if layer.box else request.box.dimensions
-        for placement in layer.placements:
-            center = frame.restore(
-                placement.position,
-                pallet=request.pallet,
-                overhang_x=request.overhang_x,
-                overhang_y=request.overhang_y,
-            )
-            center = Vector3(center.x, center.y, center.z + layer_idx * explode_gap)
+        xs, ys = layer.restored_columns(
+            frame,
+            pallet=request.pallet,
+            overhang_x=request.overhang_x,
+            overhang_y=request.overhang_y,
+        )
+        for placement, x, y in zip(layer.placements, xs, ys):
+            center = Vector3(x, y, placement.position.z + layer_idx * explode_gap)
             width, depth = _footprint(box_dims.width, box_dims.depth, placement.rotation)
             half_w = width / 2
             half_d = depth / 2
@@ -1,60 +1,104 @@
 """Simple relational repository backed by SQLite."""
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 
 from .models import Box, Dimensions, Interleaf, Pallet, PickupOffset, Tool
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pallets (
+    id TEXT PRIMARY KEY,
+    width REAL,
+    depth REAL,
+    height REAL,
+    max_overhang_x REAL,
+    max_overhang_y REAL
+);
+CREATE TABLE IF NOT EXISTS boxes (
+    id TEXT PRIMARY KEY,
+    width REAL,
+    depth REAL,
+    height REAL,
+    weight REAL,
+    label_position TEXT
+);
+CREATE TABLE IF NOT EXISTS tools (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    max_boxes INTEGER,
+    orientations TEXT,
+    offset_x REAL,
+    offset_y REAL,
+    offset_z REAL
+);
+CREATE TABLE IF NOT EXISTS interleaves (
+    id TEXT PRIMARY KEY,
+    thickness REAL,
+    weight REAL,
+    material TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_SEED_TABLES = ("pallets", "boxes", "tools", "interleaves")
+
+_T = TypeVar("_T")
+
+
+def _read_seed(seed_path: str | Path) -> tuple[str, dict[str, tuple[dict[str, Any], ...]]]:
+    """Return the digest and parsed rows of a seed file, reusing earlier parses."""
+    path = Path(seed_path).resolve()
+    stat = path.stat()
+    return _load_seed(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_seed(
+    path: str, mtime_ns: int, size: int
+) -> tuple[str, dict[str, tuple[dict[str, Any], ...]]]:
+    raw = Path(path).read_bytes()
+    seed = json.loads(raw.decode("utf-8"))
+    rows = {table: tuple(seed.get(table, ())) for table in _SEED_TABLES}
+    return hashlib.sha1(raw).hexdigest(), rows
+
+
+_MEMORY = ":memory:"
+
+
 class DataRepository:
-    def __init__(self, db_path: str | Path = "verpal.db") -> None:
-        self.db_path = Path(db_path)
-        self.connection = sqlite3.connect(self.db_path)
+    def __init__(self, db_path: str | Path = "verpal.db", *, in_memory: bool = False) -> None:
+        self.in_memory = in_memory or str(db_path) == _MEMORY
+        if self.in_memory:
+            self.db_path = Path(_MEMORY)
+            self.connection = sqlite3.connect(_MEMORY)
+        else:
+            self.db_path = Path(db_path)
+            self.connection = sqlite3.connect(self.db_path)
+            # The catalog can always be rebuilt from the seed file, so trade
+            # durability for fewer journal writes and fsyncs.
+            self.connection.execute("PRAGMA journal_mode=MEMORY")
+            self.connection.execute("PRAGMA synchronous=OFF")
         self.connection.row_factory = sqlite3.Row
+        self._clear_cache()
 
     def initialize(self, seed_path: str | Path) -> None:
-        seed = json.loads(Path(seed_path).read_text(encoding="utf-8"))
-        with self.connection:
-            self.connection.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS pallets (
-                    id TEXT PRIMARY KEY,
-                    width REAL,
-                    depth REAL,
-                    height REAL,
-                    max_overhang_x REAL,
-                    max_overhang_y REAL
-                );
-                CREATE TABLE IF NOT EXISTS boxes (
-                    id TEXT PRIMARY KEY,
-                    width REAL,
-                    depth REAL,
-                    height REAL,
-                    weight REAL,
-                    label_position TEXT
-                );
-                CREATE TABLE IF NOT EXISTS tools (
-                    id TEXT PRIMARY KEY,
-                    name TEXT,
-                    max_boxes INTEGER,
-                    orientations TEXT,
-                    offset_x REAL,
-                    offset_y REAL,
-                    offset_z REAL
-                );
-                CREATE TABLE IF NOT EXISTS interleaves (
-                    id TEXT PRIMARY KEY,
-                    thickness REAL,
-                    weight REAL,
-                    material TEXT
-                );
-                """
-            )
-        if self._is_populated("pallets"):
+        digest, seed = _read_seed(seed_path)
+        if self._seed_digest() == digest:
             return
         with self.connection:
+            self.connection.executescript(_SCHEMA)
+        with self.connection:
+            # A new digest means the seed changed: upsert every row before
+            # recording it, even when the tables already hold an older seed.
             self.connection.executemany(
                 "INSERT OR REPLACE INTO pallets VALUES (:id,:width,:depth,:height,:max_overhang_x,:max_overhang_y)",
                 seed["pallets"],
@@ -69,109 +113,123 @@ class DataRepository:
             )
             self.connection.executemany(
                 "INSERT OR REPLACE INTO interleaves VALUES (:id,:thickness,:weight,:material)",
-                seed.get("interleaves", []),
+                seed["interleaves"],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('seed_digest', ?)",
+                (digest,),
             )
+        self._clear_cache()
 
-    def _is_populated(self, table: str) -> bool:
-        cur = self.connection.execute(f"SELECT COUNT(1) FROM {table}")
-        return cur.fetchone()[0] > 0
+    def _seed_digest(self) -> str | None:
+        try:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key='seed_digest'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
 
     def get_pallet(self, pallet_id: str) -> Pallet:
-        row = self.connection.execute("SELECT * FROM pallets WHERE id=?", (pallet_id,)).fetchone()
-        if row is None:
+        pallet = self._get_cached("pallets", pallet_id, _pallet_from_row)
+        if pallet is None:
             raise KeyError(f"Pallet {pallet_id} not found")
-        return Pallet(
-            id=row["id"],
-            dimensions=Dimensions(row["width"], row["depth"], row["height"]),
-            max_overhang_x=row["max_overhang_x"],
-            max_overhang_y=row["max_overhang_y"],
-        )
+        return pallet
 
     def list_pallets(self) -> list[Pallet]:
-        rows = self.connection.execute("SELECT * FROM pallets ORDER BY id").fetchall()
-        return [
-            Pallet(
-                id=row["id"],
-                dimensions=Dimensions(row["width"], row["depth"], row["height"]),
-                max_overhang_x=row["max_overhang_x"],
-                max_overhang_y=row["max_overhang_y"],
-            )
-            for row in rows
-        ]
+        return self._list_cached("pallets", _pallet_from_row)
 
     def get_box(self, box_id: str) -> Box:
-        row = self.connection.execute("SELECT * FROM boxes WHERE id=?", (box_id,)).fetchone()
-        if row is None:
+        box = self._get_cached("boxes", box_id, _box_from_row)
+        if box is None:
             raise KeyError(f"Box {box_id} not found")
-        return Box(
-            id=row["id"],
-            dimensions=Dimensions(row["width"], row["depth"], row["height"]),
-            weight=row["weight"],
-            label_position=row["label_position"],
-        )
+        return box
 
     def list_boxes(self) -> list[Box]:
-        rows = self.connection.execute("SELECT * FROM boxes ORDER BY id").fetchall()
-        return [
-            Box(
-                id=row["id"],
-                dimensions=Dimensions(row["width"], row["depth"], row["height"]),
-                weight=row["weight"],
-                label_position=row["label_position"],
-            )
-            for row in rows
-        ]
+        return self._list_cached("boxes", _box_from_row)
 
     def get_tool(self, tool_id: str) -> Tool:
-        row = self.connection.execute("SELECT * FROM tools WHERE id=?", (tool_id,)).fetchone()
-        if row is None:
+        tool = self._get_cached("tools", tool_id, _tool_from_row)
+        if tool is None:
             raise KeyError(f"Tool {tool_id} not found")
-        orientations = [int(value) for value in row["orientations"].split(",") if value]
-        return Tool(
-            id=row["id"],
-            name=row["name"],
-            max_boxes=row["max_boxes"],
-            allowed_orientations=orientations,
-            pickup_offset=PickupOffset(row["offset_x"], row["offset_y"], row["offset_z"]),
-        )
+        return tool
 
     def list_tools(self) -> list[Tool]:
-        rows = self.connection.execute("SELECT * FROM tools ORDER BY id").fetchall()
-        return [
-            Tool(
-                id=row["id"],
-                name=row["name"],
-                max_boxes=row["max_boxes"],
-                allowed_orientations=[
-                    int(value) for value in row["orientations"].split(",") if value
-                ],
-                pickup_offset=PickupOffset(row["offset_x"], row["offset_y"], row["offset_z"]),
-            )
-            for row in rows
-        ]
+        return self._list_cached("tools", _tool_from_row)
 
     def get_interleaf(self, interleaf_id: str) -> Interleaf:
-        row = self.connection.execute("SELECT * FROM interleaves WHERE id=?", (interleaf_id,)).fetchone()
-        if row is None:
+        interleaf = self._get_cached("interleaves", interleaf_id, _interleaf_from_row)
+        if interleaf is None:
             raise KeyError(f"Interleaf {interleaf_id} not found")
-        return Interleaf(
-            id=row["id"],
-            thickness=row["thickness"],
-            weight=row["weight"],
-            material=row["material"],
-        )
+        return interleaf
 
     def list_interleaves(self) -> list[Interleaf]:
-        rows = self.connection.execute("SELECT * FROM interleaves ORDER BY id").fetchall()
-        return [
-            Interleaf(
-                id=row["id"],
-                thickness=row["thickness"],
-                weight=row["weight"],
-                material=row["material"],
-            )
-            for row in rows
-        ]
+        return self._list_cached("interleaves", _interleaf_from_row)
+
+    def _get_cached(self, table: str, item_id: str, build: Callable[[sqlite3.Row], _T]) -> _T | None:
+        """Return the shared instance for ``item_id``, loading it on first use."""
+        cache = self._cache[table]
+        item = cache.get(item_id)
+        if item is None:
+            row = self.connection.execute(f"SELECT * FROM {table} WHERE id=?", (item_id,)).fetchone()
+            if row is None:
+                return None
+            item = cache[item_id] = build(row)
+        return item
+
+    def _list_cached(self, table: str, build: Callable[[sqlite3.Row], _T]) -> list[_T]:
+        """Return every row of ``table`` ordered by id, reusing cached instances."""
+        if table not in self._complete:
+            cache = self._cache[table]
+            rows = self.connection.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+            self._cache[table] = {
+                row["id"]: cache.get(row["id"]) or build(row) for row in rows
+            }
+            self._complete.add(table)
+        return list(self._cache[table].values())
+
+    def _clear_cache(self) -> None:
+        # Catalog rows are immutable reference data: hand out one shared
+        # instance per id until the tables are written again.
+        self._cache: dict[str, dict[str, Any]] = {table: {} for table in _SEED_TABLES}
+        self._complete: set[str] = set()
 
     def close(self) -> None:
         self.connection.close()
+
+
+def _pallet_from_row(row: sqlite3.Row) -> Pallet:
+    return Pallet(
+        id=row["id"],
+        dimensions=Dimensions(row["width"], row["depth"], row["height"]),
+        max_overhang_x=row["max_overhang_x"],
+        max_overhang_y=row["max_overhang_y"],
+    )
+
+
+def _box_from_row(row: sqlite3.Row) -> Box:
+    return Box(
+        id=row["id"],
+        dimensions=Dimensions(row["width"], row["depth"], row["height"]),
+        weight=row["weight"],
+        label_position=row["label_position"],
+    )
+
+
+def _tool_from_row(row: sqlite3.Row) -> Tool:
+    return Tool(
+        id=row["id"],
+        name=row["name"],
+        max_boxes=row["max_boxes"],
+        allowed_orientations=tuple(int(value) for value in row["orientations"].split(",") if value),
+        pickup_offset=PickupOffset(row["offset_x"], row["offset_y"], row["offset_z"]),
+    )
+
+
+def _interleaf_from_row(row: sqlite3.Row) -> Interleaf:
+    return Interleaf(
+        id=row["id"],
+        thickness=row["thickness"],
+        weight=row["weight"],
+        material=row["material"],
+    )
@@ -13,7 +13,6 @@ from .models import (
     LayerPlacement,
     LayerRequest,
     LayerSequencePlan,
-    Vector3,
 )
 from .planner import RecursiveFiveBlockPlanner
 
@@ -49,22 +48,28 @@ class LayerSequencePlanner:
 
         layers: list[LayerPlan] = []
         interleaves: list[InterleafPlacement] = []
+        # Levels sharing a start corner share the same layer layout, so each
+        # distinct corner is planned once and only elevated afterwards.
+        corner_plans: dict[str, tuple[LayerRequest, LayerPlan]] = {}
+        # Collision checks only look at the footprint, which elevation leaves
+        # untouched, so each corner is validated once as well.
+        corner_collisions: dict[str, list[str]] = {}
         current_z = 0.0
         for level in range(levels):
             corner = ordered_corners[level % len(ordered_corners)]
-            level_request = replace(request, start_corner=corner)
-            plan = self.layer_planner.plan_layer(level_request)
+            if corner not in corner_plans:
+                corner_request = replace(request, start_corner=corner)
+                corner_plans[corner] = (corner_request, self.layer_planner.plan_layer(corner_request))
+            level_request, plan = corner_plans[corner]
             elevated = [
-                LayerPlacement(
-                    box_id=placement.box_id,
-                    position=Vector3(
-                        x=placement.position.x,
-                        y=placement.position.y,
-                        z=placement.position.z + current_z,
-                    ),
-                    rotation=placement.rotation,
-                    block=placement.block,
-                    sequence_index=placement.sequence_index,
+                LayerPlacement._unchecked(
+                    placement.box_id,
+                    placement.position.x,
+                    placement.position.y,
+                    placement.position.z + current_z,
+                    placement.rotation,
+                    placement.block,
+                    placement.sequence_index,
                 )
                 for placement in plan.placements
             ]
@@ -80,8 +85,10 @@ class LayerSequencePlanner:
                 approach_overrides=approach_overrides.copy() if approach_overrides else plan.approach_overrides.copy(),
             )
             if collision_checker is not None:
-                issues = collision_checker.validate(level_plan, level_request)
-                level_plan.collisions = [issue.description for issue in issues]
+                if corner not in corner_collisions:
+                    issues = collision_checker.validate(level_plan, level_request)
+                    corner_collisions[corner] = [issue.description for issue in issues]
+                level_plan.collisions = corner_collisions[corner].copy()
             layers.append(level_plan)
             current_z += z_increment
             if (